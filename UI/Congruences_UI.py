@@ -253,21 +253,16 @@ class CongruenceUI(tk.Toplevel):
 
     def _validate_hull_dobell(self, generator, n):
         """Valida las condiciones de Hull-Dobell y muestra el estado en la etiqueta."""
-        m = generator.m
         period = generator.get_period()
 
         if generator.hull_dobell_validation():
-            if n > m:
-                raise ValueError(f"Con Hull-Dobell válido, n debe ser ≤ m ({m})")
-            self.hull_label.config(text=f"Estado Hull-Dobell: CUMPLE (Periodo = {m})", fg="green")
+            if n > period:
+                raise ValueError(f"Con Hull-Dobell válido, n debe ser ≤ periodo ({period})")
+            self.hull_label.config(text=f"Estado Hull-Dobell: CUMPLE (Periodo = {period})", fg="green")
         else:
             if n > period:
                 raise ValueError(f"No cumple Hull-Dobell. n debe ser ≤ periodo ({period})")
-
-            if period == 10**6:
-                self.hull_label.config(text=f"Estado Hull-Dobell: NO CUMPLE (Periodo estimado ≥ {period})", fg="red")
-            else:
-                self.hull_label.config(text=f"Estado Hull-Dobell: NO CUMPLE (Periodo = {period})", fg="red")
+            self.hull_label.config(text=f"Estado Hull-Dobell: NO CUMPLE (Periodo = {period})", fg="red")
 
     def _fill_table_and_sequence(self, generator, n):
         """Genera la secuencia, la guarda en memoria y la inserta en la tabla."""
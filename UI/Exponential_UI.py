@@ -66,14 +66,15 @@ class ExponentialApp(tk.Toplevel):
                 return
 
             exp_gen = ExponentialDistribution(rate, seed, n)
-            ri_values, ni_values = exp_gen.generate_exponential()
+            ni_values = exp_gen.generate_exponential_array(keep_ri=True)
+            ri_values = exp_gen.get_ri_sequence()
 
-            # Guardar en DataFrame
+            # Guardar en DataFrame (sin volver a copiar los arreglos)
             self.data = pd.DataFrame({
-                "Index": range(1, n + 1),
+                "Index": np.arange(1, n + 1),
                 "Ri": ri_values,
                 "Ni": ni_values
-            })
+            }, copy=False)
 
             # Mostrar en tabla
             for i in self.tree.get_children():
@@ -97,7 +98,7 @@ class ExponentialApp(tk.Toplevel):
         fig, ax = plt.subplots(figsize=(6, 4))
         ax.hist(ni_values, bins=30, density=True, alpha=0.6, label="Simulación")
 
-        x = np.linspace(0, max(ni_values), 100)
+        x = np.linspace(0, ni_values.max(), 100)
         y = rate * np.exp(-rate * x)
         ax.plot(x, y, 'r-', lw=2, label="Curva teórica")
 
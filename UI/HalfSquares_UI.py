@@ -184,11 +184,11 @@ class HalfSquaresUI(tk.Toplevel):
         for row in self.table.get_children():
             self.table.delete(row)
 
-        for i in range(n):
-            xi, ri = generator.next()
-            self.seeds.append(xi)
-            self.sequence.append(float(ri))
-            self.table.insert("", "end", values=(i + 1, xi, ri))
+        xi_values, ri_values = generator.generate_array(n)
+        self.seeds.extend(f"{xi:0{generator.digits}d}" for xi in xi_values.tolist())
+        self.sequence.extend(ri_values.tolist())
+        for i, (xi, ri) in enumerate(zip(self.seeds, self.sequence)):
+            self.table.insert("", "end", values=(i + 1, xi, f"{ri:.5f}"))
 
         self._plot_sequence()
 
@@ -0,0 +1,77 @@
+import numpy as np
+
+from distributions.Distributions import make_ri_generator
+
+
+# Tabla de alias de Walker/Vose para una distribución discreta de k resultados.
+# Se construye una sola vez en O(k); cada muestra cuesta O(1): se elige una
+# columna i uniforme y se devuelve i con probabilidad prob[i] o alias[i] si no.
+class AliasTable:
+
+    def __init__(self, weights):
+        w = np.asarray(weights, dtype=np.float64)
+        if w.ndim != 1 or w.size == 0:
+            raise ValueError("Los pesos deben ser una lista no vacía")
+        if not np.all(np.isfinite(w)) or np.any(w < 0):
+            raise ValueError("Los pesos deben ser finitos y no negativos")
+        total = w.sum()
+        if total <= 0:
+            raise ValueError("La suma de los pesos debe ser mayor a 0")
+
+        self.k = w.size
+        # Probabilidades escaladas por k: la columna i está "llena" si vale 1
+        scaled = (w * (self.k / total)).tolist()
+        prob = [1.0] * self.k
+        alias = list(range(self.k))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+        # Algoritmo de Vose: cada columna pequeña se completa con una grande
+        while small and large:
+            s = small.pop()
+            l = large[-1]
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            if scaled[l] < 1.0:
+                small.append(large.pop())
+        # Lo que queda (por redondeo) son columnas llenas: prob = 1 sin alias
+
+        self.prob = np.array(prob)
+        self.alias = np.array(alias, dtype=np.intp)
+        self.prob.flags.writeable = False
+        self.alias.flags.writeable = False
+
+    # Convierte 2n Ri (columna, moneda) en n índices, vectorizado
+    def sample(self, u):
+        n = u.shape[0] // 2
+        column = (u[:n] * self.k).astype(np.intp)
+        # Con float64 u < 1, pero se protege el borde por redondeo
+        np.minimum(column, self.k - 1, out=column)
+        return np.where(u[n:2 * n] < self.prob[column], column, self.alias[column])
+
+
+class DiscreteDistribution:
+    def __init__(self, weights, seed, n, backend="lcg"):
+        self.n = n
+        self.seed = seed
+        # Se puede pasar una AliasTable ya construida para reutilizarla entre llamadas
+        self.table = weights if isinstance(weights, AliasTable) else AliasTable(weights)
+        # generador de Ri (por defecto el congruencial lineal)
+        self.lcg = make_ri_generator(self.seed, backend)
+        self.ri_secuence = []
+
+    # Genera n índices en [0, k) con las probabilidades de los pesos (lista)
+    def generate_discrete(self):
+        return self.generate_discrete_array().tolist()
+
+    # Igual que generate_discrete pero devuelve un arreglo NumPy de índices.
+    # Cada índice consume 2 Ri en float64 (columna y moneda): con los Ri de
+    # 5 decimales no se podrían distinguir más de 10^5 columnas.
+    def generate_discrete_array(self):
+        u = self.lcg.generate_block(2 * self.n, "float64")
+        self.ri_secuence = u
+        return self.table.sample(u)
+
+    def get_ri_sequence(self):
+        return self.ri_secuence
@@ -1,15 +1,62 @@
 
-from generators.Congruences import LinealCongruence
+from generators.Congruences import Congruences, LinealCongruence
+from generators.MRG32k3a import MRG32k3a
+from distributions.Ziggurat import ziggurat_normal
+from distributions.NormalMethods import polar_normal, inverse_normal
+from distributions import Rejection
+from utils.buffer_utils import as_writable_array
 import math
+import numpy as np
+
+# Cantidad de valores que se transforman por bloque en fill()
+_FILL_CHUNK = 2**18
+
+# Generadores de Ri disponibles como backend de las distribuciones
+BACKENDS = ("lcg", "mrg32k3a")
+
+
+# Crea el generador de Ri del backend elegido:
+#   lcg      -> congruencial lineal con parametros para generar minimo 1 millon de numeros
+#   mrg32k3a -> generador combinado MRG32k3a (periodo ~2^191)
+# Si 'seed' ya es un generador se devuelve tal cual, para que varias distribuciones
+# compartan (y continuen) el mismo flujo de Ri.
+def make_ri_generator(seed, backend="lcg"):
+    if isinstance(seed, Congruences):
+        return seed
+    if backend == "lcg":
+        return LinealCongruence(xo_seed=seed, k=551757622, c=12345, g=31)
+    if backend == "mrg32k3a":
+        return MRG32k3a(seed)
+    raise ValueError(f"Backend desconocido: {backend}. Opciones: {BACKENDS}")
+
+
+# Transformacion de Box-Muller vectorizada: escribe len(out) normales en out a partir
+# de pares (u1, u2) de u, en el mismo orden z0, z1 que generate_normal. El radio se
+# calcula una sola vez por par y u no se modifica.
+def _box_muller(u, out, mean, stddev):
+    count = out.shape[0]
+    n_cos, n_sin = (count + 1) // 2, count // 2
+    radius = np.clip(u[0:2 * n_cos:2], 1e-10, 1 - 1e-10)
+    np.log(radius, out=radius)
+    radius *= -2
+    np.sqrt(radius, out=radius)
+    theta = np.clip(u[1:2 * n_cos:2], 1e-10, 1 - 1e-10)
+    theta *= 2 * math.pi
+    np.multiply(radius, np.cos(theta), out=out[0::2])
+    np.multiply(radius[:n_sin], np.sin(theta[:n_sin]), out=out[1::2])
+    out *= stddev
+    out += mean
+    return out
+
 
 class UniformDistribution:
-    def __init__(self, seed, n,a,b):
+    def __init__(self, seed, n,a,b, backend="lcg"):
         self.n = n
         self.seed = seed
         self.a = a
         self.b = b
-        # generador de Ri congruencial lineal con parametros para generar minimo 1 millon de numeros
-        self.lcg = LinealCongruence(xo_seed=self.seed, k=551757622, c=12345, g=31)
+        # generador de Ri (por defecto el congruencial lineal)
+        self.lcg = make_ri_generator(self.seed, backend)
         self.ri_secuence = []
 
     # Genera los numeros Ni bajo una distribucion uniforme
@@ -18,21 +65,58 @@ class UniformDistribution:
         # secuencia de numeros uniformes con la formula de transformacion a Ni
         uniform_sequence = [self.a + (self.b - self.a) * r for r in self.ri_secuence]
         return uniform_sequence
+
+    # Llena un buffer escribible con len(out) números Ni uniformes, en el sitio
+    def fill(self, out):
+        arr = as_writable_array(out)
+        self.lcg.fill(arr, "legacy")
+        arr *= self.b - self.a
+        arr += self.a
+        return out
+
+    # Generador sin fin: entrega arreglos de chunk_size numeros Ni en memoria constante.
+    # Con keep_ri, ri_secuence guarda solo los Ri del ultimo bloque entregado.
+    def stream(self, chunk_size=_FILL_CHUNK, keep_ri=False):
+        while True:
+            values = self.lcg.generate_block(chunk_size)
+            self.ri_secuence = values.copy() if keep_ri else []
+            values *= self.b - self.a
+            values += self.a
+            yield values
+
     def get_ri_sequence(self):
         return self.ri_secuence
     
 class NormalDistribution:
-    def __init__(self, mean, stddev, seed, n):
+    # Metodos de generacion disponibles
+    METHODS = ("box-muller", "ziggurat", "polar", "inverse")
+
+    def __init__(self, mean, stddev, seed, n, backend="lcg", method="box-muller"):
+        self.method = self._check_method(method)
         self.mean = mean
         self.stddev = stddev
         self.n = n
         self.seed = seed
-        # generador de Ri congruencial lineal con parametros para generar minimo 1 millon de numeros
-        self.lcg = LinealCongruence(xo_seed=self.seed, k=551757622, c=12345, g=31)
+        # generador de Ri (por defecto el congruencial lineal)
+        self.lcg = make_ri_generator(self.seed, backend)
         self.ri_secuence = []
 
+    # Valida el metodo pedido; None usa el elegido en el constructor
+    def _check_method(self, method):
+        if method is None:
+            return self.method
+        if method not in self.METHODS:
+            raise ValueError(f"Metodo desconocido: {method}. Opciones: {self.METHODS}")
+        return method
+
     # Genera los numeros Ni bajo una distribucion normal usando el metodo de Box-Muller
-    def generate_normal(self):
+    # (o el metodo elegido en el constructor o en esta llamada)
+    def generate_normal(self, method=None):
+        method = self._check_method(method)
+        if method != "box-muller":
+            normal_sequence = self.generate_normal_array(method=method).tolist()
+            self.ri_secuence = self.ri_secuence.tolist()
+            return normal_sequence
         self.ri_secuence = self.lcg.generate_sequence(self.n * 2)  # Necesitamos el doble de numeros
         normal_sequence = []
         for i in range(0, len(self.ri_secuence), 2):
@@ -47,7 +131,163 @@ class NormalDistribution:
                 normal_sequence.append(self.mean + self.stddev * z1)
 
         return normal_sequence[:self.n]
+
+    # Version vectorizada de generate_normal: devuelve un arreglo float64 preasignado
+    # con n numeros Ni. Box-Muller usa 2*ceil(n/2) Ri, la CDF inversa exactamente n;
+    # Ziggurat y polar guardan todos los Ri que consumieron. Si keep_ri es False no
+    # se guardan.
+    def generate_normal_array(self, keep_ri=True, method=None):
+        values, ri = self._normal_block(self.n, self._check_method(method), keep_ri)
+        self.ri_secuence = ri if keep_ri else []
+        return values
+
+    # count numeros Ni con el metodo dado, junto con los Ri consumidos
+    # (Ziggurat no junta los Ri si no se van a guardar)
+    def _normal_block(self, count, method, keep_ri=True):
+        if method == "box-muller":
+            ri = self.lcg.generate_block(2 * ((count + 1) // 2))
+            return _box_muller(ri, np.empty(count), self.mean, self.stddev), ri
+        if method == "ziggurat":
+            z, ri = ziggurat_normal(self.lcg, count, keep_ri)
+        elif method == "polar":
+            z, ri = polar_normal(self.lcg, count)
+        else:
+            z, ri = inverse_normal(self.lcg, count)
+        z *= self.stddev
+        z += self.mean
+        return z, ri
+
+    # Llena un buffer escribible con len(out) números Ni normales (Box-Muller por
+    # bloques, mismo orden z0, z1 que generate_normal)
+    def fill(self, out, method=None):
+        method = self._check_method(method)
+        arr = as_writable_array(out)
+        for start in range(0, arr.size, _FILL_CHUNK):
+            count = min(_FILL_CHUNK, arr.size - start)
+            if method != "box-muller":
+                arr[start:start + count] = self._normal_block(count, method, keep_ri=False)[0]
+                continue
+            u = self.lcg.generate_block(2 * ((count + 1) // 2))
+            _box_muller(u, arr[start:start + count], self.mean, self.stddev)
+        return out
+
+    # Generador sin fin: entrega arreglos de chunk_size numeros Ni en memoria constante.
+    # La concatenacion de los bloques es la misma secuencia que generate_normal_array
+    # para cualquier chunk_size: con Box-Muller, si un bloque deja un z1 sin usar se
+    # guarda y es el primer valor del bloque siguiente. Con keep_ri, ri_secuence
+    # guarda los Ri consumidos por el ultimo bloque.
+    def stream(self, chunk_size=_FILL_CHUNK, keep_ri=False, method=None):
+        method = self._check_method(method)
+        if method != "box-muller":
+            while True:
+                values, ri = self._normal_block(chunk_size, method, keep_ri)
+                self.ri_secuence = ri if keep_ri else []
+                yield values
+        spare = None
+        while True:
+            values = np.empty(chunk_size)
+            start = 0
+            if spare is not None and chunk_size > 0:
+                values[0] = spare
+                spare = None
+                start = 1
+            pairs = (chunk_size - start + 1) // 2
+            ri = self.lcg.generate_block(2 * pairs)
+            z = _box_muller(ri, np.empty(2 * pairs), self.mean, self.stddev)
+            values[start:] = z[:chunk_size - start]
+            if 2 * pairs > chunk_size - start:
+                spare = z[-1]
+            self.ri_secuence = ri if keep_ri else []
+            yield values
+
+    def get_ri_sequence(self):
+        return self.ri_secuence
+
+    
+
+
+# Distribuciones por rechazo vectorizado (ver Rejection.py). Misma forma que las
+# anteriores: generate_x() devuelve una lista, generate_x_array() un arreglo NumPy
+# y get_ri_sequence() todos los Ri consumidos (si keep_ri es True).
+class PoissonDistribution:
+    def __init__(self, lam, seed, n, backend="lcg"):
+        self.lam = lam
+        self.n = n
+        self.seed = seed
+        self.lcg = make_ri_generator(self.seed, backend)
+        self.ri_secuence = []
+
+    def generate_poisson(self):
+        return self.generate_poisson_array().tolist()
+
+    def generate_poisson_array(self, keep_ri=True):
+        values, ri = Rejection.poisson(self.lcg, self.n, self.lam)
+        self.ri_secuence = ri if keep_ri else []
+        return values.astype(np.int64)
+
+    def get_ri_sequence(self):
+        return self.ri_secuence
+
+
+class BinomialDistribution:
+    def __init__(self, trials, p, seed, n, backend="lcg"):
+        self.trials = trials
+        self.p = p
+        self.n = n
+        self.seed = seed
+        self.lcg = make_ri_generator(self.seed, backend)
+        self.ri_secuence = []
+
+    def generate_binomial(self):
+        return self.generate_binomial_array().tolist()
+
+    def generate_binomial_array(self, keep_ri=True):
+        values, ri = Rejection.binomial(self.lcg, self.n, self.trials, self.p)
+        self.ri_secuence = ri if keep_ri else []
+        return values.astype(np.int64)
+
+    def get_ri_sequence(self):
+        return self.ri_secuence
+
+
+class GammaDistribution:
+    def __init__(self, shape, scale, seed, n, backend="lcg"):
+        self.shape = shape
+        self.scale = scale
+        self.n = n
+        self.seed = seed
+        self.lcg = make_ri_generator(self.seed, backend)
+        self.ri_secuence = []
+
+    def generate_gamma(self):
+        return self.generate_gamma_array().tolist()
+
+    def generate_gamma_array(self, keep_ri=True):
+        values, ri = Rejection.gamma(self.lcg, self.n, self.shape)
+        self.ri_secuence = ri if keep_ri else []
+        values *= self.scale
+        return values
+
     def get_ri_sequence(self):
         return self.ri_secuence
 
-    
\ No newline at end of file
+
+class BetaDistribution:
+    def __init__(self, a, b, seed, n, backend="lcg"):
+        self.a = a
+        self.b = b
+        self.n = n
+        self.seed = seed
+        self.lcg = make_ri_generator(self.seed, backend)
+        self.ri_secuence = []
+
+    def generate_beta(self):
+        return self.generate_beta_array().tolist()
+
+    def generate_beta_array(self, keep_ri=True):
+        values, ri = Rejection.beta(self.lcg, self.n, self.a, self.b)
+        self.ri_secuence = ri if keep_ri else []
+        return values
+
+    def get_ri_sequence(self):
+        return self.ri_secuence
@@ -2,22 +2,85 @@ import sys
 import os
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-from generators.Congruences import LinealCongruence
+from distributions.Distributions import make_ri_generator, _FILL_CHUNK
+from distributions.Ziggurat import ziggurat_exponential
+from utils.buffer_utils import as_writable_array
 
 import math
+import numpy as np
 
 class ExponentialDistribution:
-    def __init__(self, rate,seed,n):
+    # Metodos de generacion disponibles
+    METHODS = ("inverse", "ziggurat")
+
+    def __init__(self, rate,seed,n, backend="lcg", method="inverse"):
+        if method not in self.METHODS:
+            raise ValueError(f"Metodo desconocido: {method}. Opciones: {self.METHODS}")
+        self.method = method
         self.rate = rate
         self.n = n
         self.seed = seed
-        # generador de Ri congruencial lineal con parametros para generar minimo 1 millon de numeros
-        self.lcg = LinealCongruence(xo_seed=self.seed,k=551757622, c=12345, g=31)  # Ejemplo de inicialización
-
+        # generador de Ri (por defecto el congruencial lineal)
+        self.lcg = make_ri_generator(self.seed, backend)
+        self.ri_secuence = []
 
-    #Genera los numeros Ni bajo una distribucion exponencial
+    #Genera los numeros Ni bajo una distribucion exponencial.
+    #Con Ziggurat la lista de Ri son todos los Ri consumidos (puede ser mayor a n)
     def generate_exponential(self):
+        if self.method == "ziggurat":
+            z, ri = ziggurat_exponential(self.lcg, self.n)
+            z /= self.rate
+            return ri.tolist(), z.tolist()
         sequence = self.lcg.generate_sequence(self.n)
         #secuencia de numeros exponenciales con la formula de transformacion inversa
         exponential_sequence = [- (1 / self.rate) * math.log(1 - u) for u in sequence]
-        return  sequence,exponential_sequence
\ No newline at end of file
+        return  sequence,exponential_sequence
+
+    #Modo arreglo: genera los n numeros Ni en un solo arreglo NumPy, transformando
+    #los Ri en el sitio. Los Ri solo se copian si keep_ri es True (get_ri_sequence)
+    def generate_exponential_array(self, keep_ri=False):
+        if self.method == "ziggurat":
+            values, ri = ziggurat_exponential(self.lcg, self.n, keep_ri)
+            values /= self.rate
+            self.ri_secuence = ri if keep_ri else []
+            return values
+        values = np.empty(self.n)
+        self.lcg.fill(values, "legacy")
+        self.ri_secuence = values.copy() if keep_ri else []
+        return self._inverse_transform(values)
+
+    #Llena un buffer escribible con len(out) numeros Ni exponenciales, en el sitio
+    def fill(self, out):
+        arr = as_writable_array(out)
+        if self.method == "ziggurat":
+            z, _ = ziggurat_exponential(self.lcg, arr.size, keep_ri=False)
+            z /= self.rate
+            arr[:] = z
+            return out
+        self.lcg.fill(arr, "legacy")
+        self._inverse_transform(arr)
+        return out
+
+    #Generador sin fin: entrega arreglos de chunk_size numeros Ni en memoria constante.
+    #Con keep_ri, ri_secuence guarda solo los Ri del ultimo bloque entregado
+    def stream(self, chunk_size=_FILL_CHUNK, keep_ri=False):
+        while True:
+            if self.method == "ziggurat":
+                values, ri = ziggurat_exponential(self.lcg, chunk_size, keep_ri)
+                values /= self.rate
+                self.ri_secuence = ri if keep_ri else []
+            else:
+                values = self.lcg.generate_block(chunk_size)
+                self.ri_secuence = values.copy() if keep_ri else []
+                self._inverse_transform(values)
+            yield values
+
+    #Transformada inversa -(1/rate) * ln(1 - u) aplicada en el sitio sobre arr
+    def _inverse_transform(self, arr):
+        np.subtract(1, arr, out=arr)
+        np.log(arr, out=arr)
+        arr *= -(1 / self.rate)
+        return arr
+
+    def get_ri_sequence(self):
+        return self.ri_secuence
@@ -0,0 +1,114 @@
+import numpy as np
+
+from distributions.Distributions import make_ri_generator
+
+
+# Enteros uniformes en [0, s) sin sesgo con el método de Lemire (2019): para una
+# palabra cruda x uniforme en [0, M), x * s = q * M + l; se rechaza si l < M mod s
+# y se devuelve q. Con M = 2^w la división es un desplazamiento (multiply-shift).
+# Los enteros salen directamente de generate_states_block(), sin pasar por los Ri
+# de 5 decimales, por eso no hay huecos para rangos mayores a 10^5. Con s > M una
+# sola palabra solo alcanza M valores distintos: esos rangos combinan varias palabras.
+def bounded_integers(source, n, s):
+    """
+    n enteros uniformes en [0, s) a partir de los estados crudos de 'source'.
+    Devuelve (valores int64, palabras crudas consumidas).
+    """
+    if s <= 0:
+        raise ValueError("El rango debe tener al menos un valor")
+    modulus = source.m
+    if s > modulus or modulus * s > 2**64:
+        return _bounded_integers_big(source, n, s)
+
+    rejected = modulus % s
+    threshold = np.uint64(rejected)
+    span = np.uint64(s)
+    power_of_two = modulus & (modulus - 1) == 0
+    shift = np.uint64(modulus.bit_length() - 1)
+    mask = np.uint64(modulus - 1)
+    out = np.empty(n, dtype=np.int64)
+    consumed = []
+    filled = 0
+    while filled < n:
+        needed = n - filled
+        words = source.generate_states_block(_batch_size(needed, rejected, modulus))
+        consumed.append(words)
+        product = words * span
+        if power_of_two:
+            low = product & mask
+            high = product >> shift
+        else:
+            low = product % np.uint64(modulus)
+            high = product // np.uint64(modulus)
+        accepted = high[low >= threshold][:needed]
+        out[filled:filled + accepted.size] = accepted
+        filled += accepted.size
+    return out, _joined(consumed)
+
+
+# Une las palabras consumidas; con n = 0 no hubo ningún lote
+def _joined(consumed):
+    return np.concatenate(consumed) if consumed else np.empty(0, dtype=np.uint64)
+
+
+# Palabras a pedir por lote: las que faltan más los rechazos esperados (se rechaza
+# una de cada width / threshold). Para un solo valor se pide una sola palabra y se
+# vuelve a pedir solo si se rechaza, así no se gasta el flujo en llamadas escalares.
+def _batch_size(needed, threshold, width):
+    return needed + needed * threshold // (width - threshold)
+
+
+# Rangos con s > M o M * s > 2^64: se combinan varias palabras en un entero de Python
+# (W = M^k >= s) y se aplica el mismo rechazo con aritmética exacta
+def _bounded_integers_big(source, n, s):
+    modulus = source.m
+    words_per_value = 1
+    width = modulus
+    while width < s:
+        words_per_value += 1
+        width *= modulus
+    threshold = width % s
+    values = []
+    consumed = []
+    while len(values) < n:
+        needed = n - len(values)
+        batch = _batch_size(needed, threshold, width)
+        words = source.generate_states_block(words_per_value * batch)
+        consumed.append(words)
+        raw = words.tolist()
+        for i in range(batch):
+            x = 0
+            for w in raw[i * words_per_value:(i + 1) * words_per_value]:
+                x = x * modulus + w
+            high, low = divmod(x * s, width)
+            if low >= threshold:
+                values.append(high)
+    return np.array(values[:n], dtype=object), _joined(consumed)
+
+
+class IntegerDistribution:
+    def __init__(self, low, high, seed, n, backend="lcg"):
+        if high < low:
+            raise ValueError("high debe ser mayor o igual a low")
+        self.low = low
+        self.high = high
+        self.n = n
+        self.seed = seed
+        # generador de Ri (por defecto el congruencial lineal)
+        self.lcg = make_ri_generator(self.seed, backend)
+        self.ri_secuence = []
+
+    # Genera n enteros uniformes en [low, high] (ambos incluidos)
+    def generate_integer(self):
+        return self.generate_integer_array().tolist()
+
+    # Igual que generate_integer pero como arreglo NumPy. Los Ri guardados son
+    # las palabras crudas consumidas llevadas a [0, 1) (x / m), para las pruebas.
+    def generate_integer_array(self, keep_ri=True):
+        values, words = bounded_integers(self.lcg, self.n, self.high - self.low + 1)
+        self.ri_secuence = words / self.lcg.m if keep_ri else []
+        values += self.low
+        return values
+
+    def get_ri_sequence(self):
+        return self.ri_secuence
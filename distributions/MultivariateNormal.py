@@ -0,0 +1,67 @@
+import numpy as np
+
+from distributions.Distributions import NormalDistribution
+
+# Factores de Cholesky ya calculados, por identidad (id) de la matriz de covarianza.
+# Se guarda también la matriz para que su id no se reutilice mientras está en caché.
+# Si la matriz se modifica en el sitio hay que llamar a clear_cholesky_cache().
+_CHOLESKY_CACHE = {}
+_CHOLESKY_CACHE_SIZE = 32
+
+
+def cholesky_factor(cov):
+    """Factor triangular inferior L con L @ L.T = cov, en caché por identidad de cov."""
+    key = id(cov)
+    cached = _CHOLESKY_CACHE.get(key)
+    if cached is not None and cached[0] is cov:
+        return cached[1]
+    matrix = np.asarray(cov, dtype=np.float64)
+    if matrix.ndim != 2 or matrix.shape[0] != matrix.shape[1]:
+        raise ValueError("La matriz de covarianza debe ser cuadrada")
+    if not np.allclose(matrix, matrix.T):
+        raise ValueError("La matriz de covarianza debe ser simétrica")
+    try:
+        factor = np.linalg.cholesky(matrix)
+    except np.linalg.LinAlgError:
+        raise ValueError("La matriz de covarianza debe ser definida positiva") from None
+    factor.flags.writeable = False
+    if len(_CHOLESKY_CACHE) >= _CHOLESKY_CACHE_SIZE:
+        _CHOLESKY_CACHE.pop(next(iter(_CHOLESKY_CACHE)))
+    _CHOLESKY_CACHE[key] = (cov, factor)
+    return factor
+
+
+def clear_cholesky_cache():
+    _CHOLESKY_CACHE.clear()
+
+
+# Normal multivariada N(mean, cov): n vectores de dimensión d como X = Z @ L.T + mean,
+# con Z una matriz (n, d) de normales estándar de NormalDistribution (cualquiera de
+# sus métodos) y L el factor de Cholesky de cov, en una sola multiplicación.
+class MultivariateNormalDistribution:
+    def __init__(self, mean, cov, seed, n, backend="lcg", method="box-muller"):
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.factor = cholesky_factor(cov)
+        if self.mean.shape != (self.factor.shape[0],):
+            raise ValueError("mean y cov deben tener la misma dimensión")
+        self.n = n
+        self.seed = seed
+        # normales estándar (y su generador de Ri)
+        self.normal = NormalDistribution(0, 1, seed, n * self.mean.size, backend, method)
+        self.lcg = self.normal.lcg
+        self.ri_secuence = []
+
+    # Genera los n vectores como lista de listas
+    def generate_multivariate(self):
+        return self.generate_multivariate_array().tolist()
+
+    # Genera los n vectores como arreglo NumPy de forma (n, d)
+    def generate_multivariate_array(self, keep_ri=True):
+        z = self.normal.generate_normal_array(keep_ri).reshape(self.n, self.mean.size)
+        self.ri_secuence = self.normal.get_ri_sequence()
+        values = z @ self.factor.T
+        values += self.mean
+        return values
+
+    def get_ri_sequence(self):
+        return self.ri_secuence
@@ -0,0 +1,123 @@
+"""
+Métodos adicionales para la normal estándar: polar de Marsaglia y CDF inversa.
+
+Ambos reciben 'source' (un generador del proyecto) y devuelven
+(valores, Ri consumidos), igual que Ziggurat.py.
+
+Comparación de todos los métodos de NormalDistribution:
+    python -m distributions.NormalMethods 1000000
+"""
+
+import math
+import sys
+import time
+
+import numpy as np
+
+# Coeficientes de la aproximación racional de Acklam para la CDF inversa
+# (error relativo < 1.15e-9 en todo (0, 1))
+_A = (-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+      1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00)
+_B = (-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+      6.680131188771972e+01, -1.328068155288572e+01)
+_C = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00,
+      -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00)
+_D = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00,
+      3.754408661907416e+00)
+_P_LOW = 0.02425
+
+
+def _horner(coefs, x):
+    result = np.full_like(x, coefs[0])
+    for c in coefs[1:]:
+        result *= x
+        result += c
+    return result
+
+
+# Aproximación de Acklam de la CDF inversa normal, vectorizada, para p en (0, 1)
+def acklam_ppf(p):
+    p = np.asarray(p, dtype=np.float64)
+    out = np.empty_like(p)
+
+    central = (p >= _P_LOW) & (p <= 1 - _P_LOW)
+    q = p[central] - 0.5
+    r = q * q
+    out[central] = _horner(_A, r) * q / (_horner(_B, r) * r + 1)
+
+    # Colas: se usa la simetría, la cola superior es la inferior de 1 - p
+    tail = ~central
+    pt = p[tail]
+    low = np.minimum(pt, 1 - pt)
+    q = np.sqrt(-2 * np.log(low))
+    x = _horner(_C, q) / (_horner(_D, q) * q + 1)
+    out[tail] = np.where(pt < 0.5, x, -x)
+    return out
+
+
+def inverse_normal(source, n):
+    """
+    n normales estándar por CDF inversa: exactamente un estado del generador por
+    variable y en el mismo orden del flujo, así que el bloque i..i+k de la salida
+    solo depende de los estados i..i+k (útil para generar por bloques en paralelo).
+    Se usa u = (x + 0.5) / m para quedar siempre dentro de (0, 1).
+    Devuelve (valores, Ri consumidos).
+    """
+    u = source.generate_states_block(n).astype(np.float64)
+    u += 0.5
+    u /= source.m
+    return acklam_ppf(u), u
+
+
+def polar_normal(source, n):
+    """
+    n normales estándar con el método polar de Marsaglia: pares (v1, v2) en el
+    cuadrado [-1, 1)^2, se aceptan los que caen dentro del círculo unitario
+    (~78.5%) y cada par aceptado da dos normales sin senos ni cosenos.
+    Rechazo por lotes vectorizado. Devuelve (valores, Ri consumidos).
+    """
+    out = np.empty(n)
+    consumed = []
+    filled = 0
+    while filled < n:
+        pairs = (n - filled + 1) // 2
+        batch = int(pairs * 1.3) + 8
+        u = source.generate_block(2 * batch, "float64")
+        consumed.append(u)
+        v = 2 * u - 1
+        v1, v2 = v[:batch], v[batch:]
+        s = v1 * v1 + v2 * v2
+        ok = (s > 0) & (s < 1)
+        s, v1, v2 = s[ok], v1[ok], v2[ok]
+        factor = np.sqrt(-2 * np.log(s) / s)
+        z = np.empty(2 * s.size)
+        np.multiply(v1, factor, out=z[0::2])
+        np.multiply(v2, factor, out=z[1::2])
+        take = z[:n - filled]
+        out[filled:filled + take.size] = take
+        filled += take.size
+    # Con n = 0 no hay lotes que unir
+    ri = np.concatenate(consumed) if consumed else np.empty(0)
+    return out, ri
+
+
+# Tiempo de generate_normal_array para cada método, con el mismo n y semilla
+def benchmark(n=10**6, seed=12345, backend="lcg", repeat=3):
+    from distributions.Distributions import NormalDistribution
+
+    results = {}
+    for method in NormalDistribution.METHODS:
+        best = math.inf
+        for _ in range(repeat):
+            dist = NormalDistribution(0, 1, seed, n, backend, method)
+            start = time.perf_counter()
+            dist.generate_normal_array(keep_ri=False)
+            best = min(best, time.perf_counter() - start)
+        results[method] = best
+    return results
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 10**6
+    for name, seconds in benchmark(size).items():
+        print(f"{name:12s} {seconds * 1000:10.1f} ms  ({size / seconds / 1e6:.1f} M/s)")
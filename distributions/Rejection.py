@@ -0,0 +1,276 @@
+import math
+
+import numpy as np
+
+from distributions.Ziggurat import ziggurat_normal
+
+# Muestreadores vectorizados por rechazo (Poisson, binomial, gamma y beta).
+# Todos reciben 'source' (un generador del proyecto con generate_block(n, output))
+# y devuelven (valores, Ri consumidos), igual que Ziggurat.py. Cada lote propone
+# algo más de candidatos que los que faltan según la tasa de aceptación.
+
+# Umbrales a partir de los cuales se usa rechazo en lugar de inversión por tabla
+_POISSON_PTRS_MIN = 10
+_BINOMIAL_BTPE_MIN = 30
+
+_LOG_FACTORIAL_TABLE = np.array([math.lgamma(k + 1) for k in range(16)])
+_HALF_LOG_2PI = 0.5 * math.log(2 * math.pi)
+
+
+# log(k!) vectorizado: tabla para k < 16 y serie de Stirling para el resto
+# (error < 1e-12 desde k = 16)
+def log_factorial(k):
+    k = np.asarray(k, dtype=np.float64)
+    out = np.empty_like(k)
+    small = k < 16
+    out[small] = _LOG_FACTORIAL_TABLE[k[small].astype(np.intp)]
+    x = k[~small] + 1
+    inv2 = 1 / (x * x)
+    out[~small] = (x - 0.5) * np.log(x) - x + _HALF_LOG_2PI + (1 / 12 - (1 / 360 - inv2 / 1260) * inv2) / x
+    return out
+
+
+# Ri en float64 dentro de (0, 1]: 1 - u evita log(0)
+def _uniforms(source, count, consumed):
+    u = source.generate_block(count, "float64")
+    consumed.append(u)
+    return 1 - u
+
+
+# Une los Ri consumidos; con n = 0 no hubo ningún lote
+def _joined(consumed):
+    return np.concatenate(consumed) if consumed else np.empty(0)
+
+
+# Repite 'propose(faltantes)' hasta juntar n valores aceptados
+def _batched(n, propose):
+    out = np.empty(n)
+    filled = 0
+    while filled < n:
+        accepted = propose(n - filled)[:n - filled]
+        out[filled:filled + accepted.size] = accepted
+        filled += accepted.size
+    return out
+
+
+# Inversión por tabla para distribuciones discretas con pocos valores probables:
+# un Ri por variable, índice = primer k con F(k) > u
+def _inverse_table(source, n, pmf, consumed):
+    cdf = np.cumsum(pmf)
+    u = source.generate_block(n, "float64")
+    consumed.append(u)
+    k = np.searchsorted(cdf, u, side="right")
+    np.minimum(k, cdf.size - 1, out=k)
+    return k.astype(np.float64)
+
+
+# Probabilidades de Poisson(lam) hasta que la cola restante es despreciable
+def _poisson_pmf(lam):
+    pmf = [math.exp(-lam)]
+    total = pmf[0]
+    k = 0
+    while total < 1 - 1e-16 and k < lam + 40:
+        k += 1
+        pmf.append(pmf[-1] * lam / k)
+        total += pmf[-1]
+    return np.array(pmf)
+
+
+# Probabilidades de Binomial(trials, r) con trials * r pequeño. Por redondeo la
+# suma puede no llegar nunca a 1 - 1e-16, así que k tiene además una cota fija
+# (media + 40 desviaciones) y se corta cuando, pasada la moda, el término es < 1e-17
+def _binomial_pmf(trials, r):
+    q = 1 - r
+    mean = trials * r
+    limit = min(trials, math.ceil(mean + 40 * math.sqrt(mean) + 40))
+    pmf = [q ** trials]
+    total = pmf[0]
+    k = 0
+    while total < 1 - 1e-16 and k < limit:
+        pmf.append(pmf[-1] * (trials - k) / (k + 1) * r / q)
+        total += pmf[-1]
+        k += 1
+        if k > mean and pmf[-1] < 1e-17:
+            break
+    return np.array(pmf)
+
+
+def poisson(source, n, lam):
+    """
+    n variables de Poisson(lam). Para lam >= 10 usa PTRS (Hörmann, 1993):
+    rechazo transformado con squeeze, ~1.1 pares de Ri por variable.
+    Para lam menor usa inversión por tabla. Devuelve (valores, Ri consumidos).
+    """
+    if lam < 0:
+        raise ValueError("lam debe ser mayor o igual a 0")
+    consumed = []
+    if lam == 0:
+        return np.zeros(n), np.empty(0)
+    if lam < _POISSON_PTRS_MIN:
+        values = _inverse_table(source, n, _poisson_pmf(lam), consumed)
+        return values, _joined(consumed)
+
+    slam = math.sqrt(lam)
+    loglam = math.log(lam)
+    b = 0.931 + 2.53 * slam
+    a = -0.059 + 0.02483 * b
+    log_invalpha = math.log(1.1239 + 1.1328 / (b - 3.4))
+    vr = 0.9277 - 3.6224 / (b - 2)
+
+    def propose(count):
+        batch = count + count // 8 + 8
+        uv = _uniforms(source, 2 * batch, consumed)
+        u = uv[:batch] - 0.5
+        v = uv[batch:]
+        us = 0.5 - np.abs(u)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            k = np.floor((2 * a / us + b) * u + lam + 0.43)
+        # Squeeze: aceptación inmediata en la parte central
+        fast = (us >= 0.07) & (v <= vr)
+        # Rechazo inmediato de k < 0 y de la zona estrecha de los bordes
+        check = ~fast & (k >= 0) & (us > 0) & ~((us < 0.013) & (v > us))
+        idx = np.nonzero(check)[0]
+        ki, ui = k[idx], us[idx]
+        lhs = np.log(v[idx]) + log_invalpha - np.log(a / (ui * ui) + b)
+        accept = fast
+        accept[idx] = lhs <= -lam + ki * loglam - log_factorial(ki)
+        return k[accept]
+
+    values = _batched(n, propose)
+    return values, _joined(consumed)
+
+
+def binomial(source, n, trials, p):
+    """
+    n variables Binomial(trials, p). Para trials * min(p, 1-p) >= 30 usa BTPE
+    (Kachitvichyanukul y Schmeiser, 1988): triángulo, paralelogramo y colas
+    exponenciales; los candidatos fuera del triángulo se comparan contra
+    f(y)/f(moda) con log_factorial. Para valores menores usa inversión por tabla.
+    Devuelve (valores, Ri consumidos).
+    """
+    if trials < 0 or not 0 <= p <= 1:
+        raise ValueError("Se requiere trials >= 0 y 0 <= p <= 1")
+    consumed = []
+    r = min(p, 1 - p)
+    if trials == 0 or r == 0:
+        values = np.zeros(n) if p <= 0.5 else np.full(n, float(trials))
+        return values, np.empty(0)
+    if trials * r < _BINOMIAL_BTPE_MIN:
+        values = _inverse_table(source, n, _binomial_pmf(trials, r), consumed)
+    else:
+        values = _batched(n, _btpe_proposer(source, trials, r, consumed))
+    if p > 0.5:
+        values = trials - values
+    return values, _joined(consumed)
+
+
+def _btpe_proposer(source, trials, r, consumed):
+    q = 1 - r
+    fm = trials * r + r
+    m = math.floor(fm)
+    p1 = math.floor(2.195 * math.sqrt(trials * r * q) - 4.6 * q) + 0.5
+    xm = m + 0.5
+    xl = xm - p1
+    xr = xm + p1
+    c = 0.134 + 20.5 / (15.3 + m)
+    a = (fm - xl) / (fm - xl * r)
+    laml = a * (1 + a / 2)
+    a = (xr - fm) / (xr * q)
+    lamr = a * (1 + a / 2)
+    p2 = p1 * (1 + 2 * c)
+    p3 = p2 + c / laml
+    p4 = p3 + c / lamr
+    log_fm = log_factorial(np.array([m, trials - m]))
+    log_mode = log_fm[0] + log_fm[1]
+    log_ratio = math.log(r / q)
+
+    def propose(count):
+        batch = count + count // 4 + 8
+        uv = _uniforms(source, 2 * batch, consumed)
+        u = uv[:batch] * p4
+        v = uv[batch:]
+        y = np.empty(batch)
+        w = v.copy()
+
+        # Región 1: triángulo central, aceptación directa
+        tri = u <= p1
+        y[tri] = np.floor(xm - p1 * v[tri] + u[tri])
+        # Región 2: paralelogramos
+        par = ~tri & (u <= p2)
+        x = xl + (u[par] - p1) / c
+        w[par] = v[par] * c + 1 - np.abs(m - x + 0.5) / p1
+        y[par] = np.floor(x)
+        # Región 3: cola exponencial izquierda
+        left = ~tri & ~par & (u <= p3)
+        y[left] = np.floor(xl + np.log(v[left]) / laml)
+        w[left] = v[left] * (u[left] - p2) * laml
+        # Región 4: cola exponencial derecha
+        right = u > p3
+        y[right] = np.floor(xr - np.log(v[right]) / lamr)
+        w[right] = v[right] * (u[right] - p3) * lamr
+
+        check = ~tri & (y >= 0) & (y <= trials) & (w <= 1)
+        idx = np.nonzero(check)[0]
+        yi = y[idx]
+        log_f = log_mode - log_factorial(yi) - log_factorial(trials - yi) + (yi - m) * log_ratio
+        accept = tri
+        with np.errstate(divide="ignore"):
+            accept[idx] = np.log(w[idx]) <= log_f
+        return y[accept]
+
+    return propose
+
+
+def gamma(source, n, shape):
+    """
+    n variables Gamma(shape, 1) con el método de Marsaglia y Tsang (2000):
+    rechazo sobre una normal transformada, con normales del método Ziggurat.
+    Para shape < 1 se usa Gamma(shape + 1) * U^(1/shape).
+    Devuelve (valores, Ri consumidos).
+    """
+    if shape <= 0:
+        raise ValueError("shape debe ser mayor a 0")
+    consumed = []
+    boost = shape < 1
+    d = (shape + 1 if boost else shape) - 1 / 3
+    c = 1 / math.sqrt(9 * d)
+
+    def propose(count):
+        batch = count + count // 16 + 8
+        x, ri = ziggurat_normal(source, batch)
+        consumed.append(ri)
+        u = _uniforms(source, batch, consumed)
+        t = 1 + c * x
+        valid = t > 0
+        v = t * t * t
+        accept = valid
+        xv, vv = x[valid], v[valid]
+        accept[valid] = np.log(u[valid]) < 0.5 * xv * xv + d - d * vv + d * np.log(vv)
+        return d * v[accept]
+
+    values = _batched(n, propose)
+    if boost:
+        values *= _uniforms(source, n, consumed) ** (1 / shape)
+    return values, _joined(consumed)
+
+
+def beta(source, n, a, b):
+    """
+    n variables Beta(a, b) como X / (X + Y) con X ~ Gamma(a), Y ~ Gamma(b).
+    Devuelve (valores, Ri consumidos).
+    """
+    if a <= 0 or b <= 0:
+        raise ValueError("a y b deben ser mayores a 0")
+    consumed = []
+
+    def propose(count):
+        x, rx = gamma(source, count, a)
+        y, ry = gamma(source, count, b)
+        consumed.extend((rx, ry))
+        total = x + y
+        # Con a y b muy pequeños ambas gammas pueden ser 0: se descartan
+        ok = total > 0
+        return x[ok] / total[ok]
+
+    values = _batched(n, propose)
+    return values, _joined(consumed)
@@ -0,0 +1,207 @@
+import math
+import sys
+import time
+from functools import lru_cache
+
+import numpy as np
+
+# Parámetros de Marsaglia y Tsang (2000): cantidad de capas, borde de la cola r
+# y área común v de cada capa.
+_PARAMS = {
+    "normal": (128, 3.442619855899, 9.91256303526217e-3),
+    "exponential": (256, 7.697117470131487, 3.949659822581572e-3),
+}
+
+
+# Densidad (sin normalizar) de cada distribución
+def _density(kind, x):
+    if kind == "normal":
+        return np.exp(-0.5 * x * x)
+    return np.exp(-x)
+
+
+# Tablas de capas: x[i] es el borde derecho de la capa i (x[0] es el ancho virtual
+# de la capa base, que incluye la cola) y f[i] = densidad(x[i]). Todas las capas
+# tienen área v, así que elegir la capa es uniforme.
+@lru_cache(maxsize=None)
+def layer_tables(kind):
+    layers, r, v = _PARAMS[kind]
+    if kind == "normal":
+        f = lambda t: math.exp(-0.5 * t * t)
+        f_inv = lambda y: math.sqrt(-2 * math.log(y))
+    else:
+        f = lambda t: math.exp(-t)
+        f_inv = lambda y: -math.log(y)
+
+    x = np.empty(layers + 1)
+    x[0] = v / f(r)
+    x[1] = r
+    for i in range(1, layers - 1):
+        x[i + 1] = f_inv(v / x[i] + f(x[i]))
+    x[layers] = 0.0
+    fx = _density(kind, x)
+    x.flags.writeable = False
+    fx.flags.writeable = False
+    return x, fx
+
+
+# Cociente x[i+1] / x[i]: la fracción de cada capa ocupada por su rectángulo interior.
+# Un candidato u * x[i] con |u| < ratio[i] se acepta sin evaluar la densidad.
+@lru_cache(maxsize=None)
+def _ratio_table(kind):
+    x, _ = layer_tables(kind)
+    ratio = x[1:] / x[:-1]
+    ratio.flags.writeable = False
+    return ratio
+
+
+# Un estado crudo del generador por candidato: se separa en el índice de capa y
+# en u uniforme en [0, 1). Con m = 2^g los bits bajos de un LCG tienen períodos
+# cortos (el bit k repite cada 2^(k+1)), así que la capa sale de los bits ALTOS y
+# u de los restantes; con m cualquiera (MRG32k3a) capa = x mod L y u = (x div L).
+def _split_states(source, count, layers, consumed):
+    states = source.generate_states_block(count)
+    m = source.m
+    if consumed is not None:
+        consumed.append(states / m)
+    if m & (m - 1) == 0:
+        shift = (m.bit_length() - 1) - (layers.bit_length() - 1)
+        layer = (states >> np.uint64(shift)).astype(np.intp)
+        states &= np.uint64((1 << shift) - 1)
+        span = 1 << shift
+    else:
+        layer = (states % np.uint64(layers)).astype(np.intp)
+        states //= np.uint64(layers)
+        span = -(-m // layers)
+    u = states.astype(np.float64)
+    u *= 1 / span
+    return layer, u
+
+
+# Ri en float64 para cuñas y cola (pocos candidatos)
+def _uniforms(source, count, consumed):
+    u = source.generate_block(count, "float64")
+    if consumed is not None:
+        consumed.append(u)
+    return u
+
+
+# Muestras de la cola (x > r) con el método de Marsaglia para la normal y por
+# falta de memoria para la exponencial. Se usa 1 - u para evitar log(0).
+def _tail(source, count, kind, r, consumed):
+    if kind == "exponential":
+        u = _uniforms(source, count, consumed)
+        return r - np.log1p(-u)
+
+    values = np.empty(count)
+    pending = np.arange(count)
+    while pending.size:
+        u = _uniforms(source, 2 * pending.size, consumed)
+        t = -np.log1p(-u[:pending.size]) / r
+        y = -np.log1p(-u[pending.size:])
+        ok = 2 * y > t * t
+        values[pending[ok]] = r + t[ok]
+        pending = pending[~ok]
+    return values
+
+
+def _ziggurat(source, n, kind, keep_ri):
+    x_tab, f_tab = layer_tables(kind)
+    ratio = _ratio_table(kind)
+    layers, r, _ = _PARAMS[kind]
+    symmetric = kind == "normal"
+    out = np.empty(n)
+    consumed = [] if keep_ri else None
+    filled = 0
+
+    while filled < n:
+        needed = n - filled
+        # La tasa de aceptación es ~99%, con un pequeño margen casi siempre basta un lote
+        batch = needed + needed // 32 + 4
+        layer, u = _split_states(source, batch, layers, consumed)
+        if symmetric:
+            u *= 2
+            u -= 1
+
+        # Rectángulo interior de la capa: aceptación directa (~99% de los candidatos)
+        x = u * np.take(x_tab, layer)
+        accept = np.abs(u) < np.take(ratio, layer)
+        rejected = np.flatnonzero(~accept)
+        rejected_layer = layer[rejected]
+
+        # Cuñas de las capas superiores: se compara contra la densidad
+        wedge = rejected[rejected_layer > 0]
+        if wedge.size:
+            w = _uniforms(source, wedge.size, consumed)
+            lw = layer[wedge]
+            y = f_tab[lw] + w * (f_tab[lw + 1] - f_tab[lw])
+            accept[wedge] = y < _density(kind, x[wedge])
+
+        # Capa base fuera del rectángulo: muestra de la cola
+        tail = rejected[rejected_layer == 0]
+        if tail.size:
+            values = _tail(source, tail.size, kind, r, consumed)
+            x[tail] = np.copysign(values, u[tail]) if symmetric else values
+            accept[tail] = True
+
+        accepted = x[accept][:needed]
+        out[filled:filled + accepted.size] = accepted
+        filled += accepted.size
+
+    # Con n = 0 no se consume nada y no hay lotes que unir
+    ri = np.concatenate(consumed) if keep_ri and consumed else np.empty(0)
+    return out, ri
+
+
+def ziggurat_normal(source, n, keep_ri=True):
+    """
+    n variables normales estándar con el método Ziggurat, usando 'source'
+    (un generador del proyecto con generate_states_block(n)) como fuente.
+    Cada candidato usa un solo estado (capa y u salen del mismo entero), ~1.06
+    estados por valor; más rápido que Box-Muller (ver benchmark()).
+    Devuelve (valores, Ri consumidos); con keep_ri=False los Ri no se juntan
+    y se devuelve un arreglo vacío.
+    """
+    return _ziggurat(source, n, "normal", keep_ri)
+
+
+def ziggurat_exponential(source, n, keep_ri=True):
+    """
+    n variables exponenciales de tasa 1 con el método Ziggurat.
+    Devuelve (valores, Ri consumidos), igual que ziggurat_normal.
+    Nota: vectorizada con NumPy, la transformada inversa (un solo log por valor)
+    es unas 3 veces más rápida; ver benchmark().
+    """
+    return _ziggurat(source, n, "exponential", keep_ri)
+
+
+# Tiempo de cada método contra su alternativa directa, con el mismo n y semilla:
+# normal (box-muller, ziggurat) y exponencial (inverse, ziggurat), sin guardar Ri.
+def benchmark(n=10**6, seed=12345, backend="lcg", repeat=3):
+    from distributions.Distributions import NormalDistribution
+    from distributions.ExponentialDistribution import ExponentialDistribution
+
+    cases = {
+        "normal box-muller": lambda: NormalDistribution(0, 1, seed, n, backend, "box-muller"),
+        "normal ziggurat": lambda: NormalDistribution(0, 1, seed, n, backend, "ziggurat"),
+        "exponential inverse": lambda: ExponentialDistribution(1, seed, n, backend, "inverse"),
+        "exponential ziggurat": lambda: ExponentialDistribution(1, seed, n, backend, "ziggurat"),
+    }
+    results = {}
+    for name, make in cases.items():
+        best = math.inf
+        for _ in range(repeat):
+            dist = make()
+            generate = (dist.generate_normal_array if isinstance(dist, NormalDistribution)
+                        else dist.generate_exponential_array)
+            start = time.perf_counter()
+            generate(keep_ri=False)
+            best = min(best, time.perf_counter() - start)
+        results[name] = best
+    return results
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 10**6
+    for name, seconds in benchmark(size).items():
+        print(f"{name:22s} {seconds * 1000:10.1f} ms  ({size / seconds / 1e6:.1f} M/s)")
@@ -1,8 +1,125 @@
+import copy
 import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from utils.buffer_utils import as_writable_array
 
 from abc import ABC, abstractmethod
 
 
+# Tamaño de bloque para la generación vectorizada (filas de la matriz de estados)
+_BLOCK_SIZE = 4096
+
+# Modos de salida del modo vectorizado y su tipo de dato:
+#   legacy  -> Ri = Xi / (m-1) truncado a 5 decimales (igual que next())
+#   float64 -> Ri en [0, 1) con los 53 bits más altos del estado, sin truncar
+#   float32 -> Ri en [0, 1) con los 24 bits más altos (mitad de memoria)
+#   uint32 / uint64 -> estados Xi crudos
+OUTPUT_MODES = {
+    "legacy": np.float64,
+    "float64": np.float64,
+    "float32": np.float32,
+    "uint32": np.uint32,
+    "uint64": np.uint64,
+}
+
+# Modo de salida que corresponde al tipo de dato de un buffer en fill()
+_DTYPE_MODES = {
+    np.dtype(np.float64): "legacy",
+    np.dtype(np.float32): "float32",
+    np.dtype(np.uint32): "uint32",
+    np.dtype(np.uint64): "uint64",
+}
+
+# Cantidad de valores que fill() genera por bloque intermedio
+_FILL_CHUNK = 64 * _BLOCK_SIZE
+
+
+# Calcula los coeficientes de salto (A_j, C_j) para j = 1.._BLOCK_SIZE, tales que
+# x_{i+j} = (A_j * x_i + C_j) mod m. Se guardan en caché por juego de parámetros
+# (una sola tabla, los bloques más cortos usan un prefijo), así que las
+# distribuciones que comparten k, c y g los calculan una sola vez.
+@lru_cache(maxsize=32)
+def _affine_powers(a, c, m):
+    powers_a = np.empty(_BLOCK_SIZE, dtype=np.uint64)
+    powers_c = np.empty(_BLOCK_SIZE, dtype=np.uint64)
+    acc_a, acc_c = 1, 0
+    for j in range(_BLOCK_SIZE):
+        acc_a = (a * acc_a) % m
+        acc_c = (a * acc_c + c) % m
+        powers_a[j] = acc_a
+        powers_c[j] = acc_c
+    powers_a.flags.writeable = False
+    powers_c.flags.writeable = False
+    return powers_a, powers_c
+
+
+# Compone el mapa afín x -> (a*x + c) mod m consigo mismo 'steps' veces por
+# cuadrados repetidos. Devuelve (A, C) con x_{i+steps} = (A * x_i + C) mod m
+# en O(log steps) multiplicaciones.
+def _affine_jump(a, c, m, steps):
+    acc_a, acc_c = 1, 0
+    cur_a, cur_c = a % m, c % m
+    while steps > 0:
+        if steps & 1:
+            acc_a, acc_c = (cur_a * acc_a) % m, (cur_a * acc_c + cur_c) % m
+        cur_a, cur_c = (cur_a * cur_a) % m, (cur_a * cur_c + cur_c) % m
+        steps >>= 1
+    return acc_a, acc_c
+
+
+# Convierte un arreglo de estados Xi (uint64, módulo m = 2^g) al modo de salida pedido
+def _convert_states(states, m, output):
+    if output not in OUTPUT_MODES:
+        raise ValueError(f"Modo de salida desconocido: {output}")
+    g = m.bit_length() - 1
+    if output == "uint64":
+        return states
+    if output == "uint32":
+        if g > 32:
+            raise ValueError("El modo uint32 requiere g <= 32")
+        return states.astype(np.uint32)
+    if output == "legacy":
+        if m - 1 <= 2**53:
+            # m-1 es exacto en float64, la división coincide con la de Python
+            ri = states.astype(np.float64)
+            ri /= m - 1
+        else:
+            ri = np.array([int(x) / (m - 1) for x in states.tolist()], dtype=np.float64)
+        ri *= 10**5
+        np.trunc(ri, out=ri)
+        ri /= 10**5
+        return ri
+
+    # float64 / float32: se toman los bits más altos del estado y se escala por 2^-bits
+    bits = 53 if output == "float64" else 24
+    if g > bits:
+        states = states >> np.uint64(g - bits)
+        g = bits
+    ri = states.astype(OUTPUT_MODES[output])
+    ri *= OUTPUT_MODES[output](2.0 ** -g)
+    return ri
+
+
+# Tarea de cada proceso del pool: llena el segmento [start, start+count) del
+# arreglo compartido con el generador ya posicionado en 'start'. fill() escribe
+# directamente sobre la vista de memoria compartida, por bloques de _FILL_CHUNK,
+# sin crear un arreglo del tamaño del segmento.
+def _fill_segment(generator, shm_name, total, start, count, output):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        out = np.ndarray((total,), dtype=OUTPUT_MODES[output], buffer=shm.buf)
+        generator.fill(out[start:start + count], output)
+        del out
+    finally:
+        shm.close()
+
+
 # Clase abstracta para generadores de congruencias
 class Congruences(ABC):
     def __init__(self, xo_seed,g):
@@ -27,6 +144,43 @@ class Congruences(ABC):
         for _ in range(n):
             sequence.append(self.next())
         return sequence
+
+    # Genera n números Ri como arreglo float64 (las subclases lo vectorizan).
+    # La implementación genérica solo conoce la salida de next(): modo legacy.
+    def generate_block(self, n, output="legacy"):
+        if output != "legacy":
+            raise ValueError(f"{type(self).__name__} solo soporta el modo de salida legacy")
+        return np.fromiter((self.next() for _ in range(n)), dtype=np.float64, count=n)
+
+    # Llena un buffer escribible ya existente (ndarray, array.array, memoryview,
+    # mmap, shared_memory...) sin crear listas intermedias. Si no se indica el
+    # modo de salida se deduce del tipo de dato del buffer (float64 -> legacy);
+    # los tipos sin modo (p. ej. int64 o array.array('i')) dan ValueError.
+    def fill(self, out, output=None):
+        arr = as_writable_array(out, OUTPUT_MODES[output or "legacy"])
+        if output is None:
+            if arr.dtype not in _DTYPE_MODES:
+                raise ValueError(f"Tipo de buffer sin modo de salida: {arr.dtype}")
+            output = _DTYPE_MODES[arr.dtype]
+        for start in range(0, arr.size, _FILL_CHUNK):
+            count = min(_FILL_CHUNK, arr.size - start)
+            arr[start:start + count] = self.generate_block(count, output)
+        return out
+
+    # Itera indefinidamente sobre bloques de chunk_size números Ri.
+    # Cada bloque se genera solo cuando se pide, así que la memoria es constante.
+    def iter_chunks(self, chunk_size=_BLOCK_SIZE, output="legacy"):
+        if chunk_size <= 0:
+            raise ValueError("chunk_size debe ser mayor a 0")
+        while True:
+            yield self.generate_block(chunk_size, output)
+
+    # Itera indefinidamente sobre los números Ri, uno por uno.
+    # Internamente genera por bloques, por lo que xo_seed va adelantado
+    # hasta el final del bloque en curso.
+    def __iter__(self):
+        for chunk in self.iter_chunks():
+            yield from chunk.tolist()
     
     # Calcula el periodo del generador
 
@@ -39,16 +193,125 @@ class LinealCongruence(Congruences):
         super().__init__(xo_seed, g)
         self.a = 1 + 2 * k
         self.c = c
+        # Posición en el flujo: cantidad de valores generados desde la semilla inicial
+        self.offset = 0
         
     # Genera la siguiente semilla y retorna un número Ri
     def next(self):
         # Toma la semilla actual y genera el siguiente número pseudoaleatorio
         self.xo_seed = (self.a * self.xo_seed + self.c) % self.m
+        self.offset += 1
         # Calcula Ri y lo retorna con 5 decimales
         ri=self.xo_seed / (self.m-1)
         ri_trucated =math.trunc(ri * 10**5) / 10**5
         return  ri_trucated
+
+    # Genera n semillas Xi como arreglo uint64 en bloques de _BLOCK_SIZE.
+    # Cada fila de bloques se llena con una sola operación vectorizada usando los
+    # coeficientes de salto, y xo_seed queda en el último estado (igual que con next()).
+    def generate_states_block(self, n):
+        if self.m > 2**64:
+            raise ValueError("El modo por bloques solo soporta g <= 64")
+        if n <= 0:
+            return np.empty(0, dtype=np.uint64)
+        block = min(n, _BLOCK_SIZE)
+        powers_a, powers_c = _affine_powers(self.a % self.m, self.c % self.m, self.m)
+        powers_a, powers_c = powers_a[:block], powers_c[:block]
+        rows = -(-n // block)
+
+        # Semillas de inicio de cada fila: la última semilla de la fila anterior
+        # (con más de una fila, block es _BLOCK_SIZE)
+        jump_a, jump_c = int(powers_a[-1]), int(powers_c[-1])
+        starts = np.empty(rows, dtype=np.uint64)
+        seed = self.xo_seed % self.m
+        for r in range(rows):
+            starts[r] = seed
+            seed = (jump_a * seed + jump_c) % self.m
+
+        # La aritmética uint64 es módulo 2^64; al ser m = 2^g basta con enmascarar
+        matrix = np.multiply(starts[:, None], powers_a[None, :])
+        matrix += powers_c[None, :]
+        matrix &= np.uint64(self.m - 1)
+        states = matrix.ravel()[:n]
+
+        self.xo_seed = int(states[-1])
+        self.offset += n
+        return states
+
+    # Genera n valores en el modo de salida pedido (ver OUTPUT_MODES).
+    # En modo legacy los Ri son idénticos a los de next().
+    def generate_block(self, n, output="legacy"):
+        return _convert_states(self.generate_states_block(n), self.m, output)
+
+    # Genera n números Ri en paralelo. La secuencia se divide en segmentos
+    # contiguos que no se solapan; cada proceso salta al inicio de su segmento con
+    # advance() y escribe en un único arreglo de memoria compartida. El resultado
+    # es idéntico bit a bit a generate_block(n).
+    def generate_parallel(self, n, workers=None, output="legacy"):
+        workers = workers or os.cpu_count() or 1
+        # Segmentos alineados al tamaño de bloque; con pocos datos no vale la pena
+        segment = max(_BLOCK_SIZE, -(-n // workers))
+        segment = -(-segment // _BLOCK_SIZE) * _BLOCK_SIZE
+        if workers == 1 or n <= segment:
+            return self.generate_block(n, output)
+
+        dtype = OUTPUT_MODES[output]
+        shm = shared_memory.SharedMemory(create=True, size=n * np.dtype(dtype).itemsize)
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                tasks = []
+                cursor = copy.copy(self)
+                for start in range(0, n, segment):
+                    count = min(segment, n - start)
+                    tasks.append(pool.submit(_fill_segment, copy.copy(cursor), shm.name, n, start, count, output))
+                    cursor.advance(count)
+                for task in tasks:
+                    task.result()
+            # Única copia completa: el segmento compartido se cierra y se borra
+            # (unlink) antes de salir para no dejarlo huérfano en el sistema, y un
+            # ndarray no puede ser dueño de un SharedMemory; el resultado tiene que
+            # vivir en memoria propia del proceso.
+            sequence = np.ndarray((n,), dtype=dtype, buffer=shm.buf).copy()
+        finally:
+            shm.close()
+            shm.unlink()
+
+        self.advance(n)
+        return sequence
+
+    # Genera la secuencia Ri usando el modo por bloques cuando es posible
+    def generate_sequence(self, n):
+        if self.m > 2**64:
+            return super().generate_sequence(n)
+        return self.generate_block(n).tolist()
     
+    # Avanza el generador 'steps' posiciones sin producir los valores intermedios.
+    # Equivale a llamar next() 'steps' veces, pero en O(log steps).
+    def advance(self, steps):
+        if steps < 0:
+            raise ValueError("steps debe ser un entero no negativo")
+        jump_a, jump_c = _affine_jump(self.a, self.c, self.m, steps)
+        self.xo_seed = (jump_a * self.xo_seed + jump_c) % self.m
+        self.offset += steps
+        return self.xo_seed
+
+    # Alias de advance()
+    def jump(self, steps):
+        return self.advance(steps)
+
+    # Estado completo del generador: parámetros, semilla actual y posición en el flujo.
+    # Ver utils/checkpoint.py para guardarlo en formato binario.
+    def getstate(self):
+        return (type(self).__name__, self.a, self.c, self.m, self.xo_seed, self.offset)
+
+    # Restaura un estado devuelto por getstate() en O(1), sin regenerar el prefijo
+    def setstate(self, state):
+        if state[0] != type(self).__name__:
+            raise ValueError(f"El estado es de {state[0]}, no de {type(self).__name__}")
+        _, a, c, m, xo_seed, offset = state
+        self.a, self.c, self.m = a, c, m
+        self.xo_seed, self.offset = xo_seed, offset
+
     # Método auxiliar: calcula la siguiente semilla SIN alterar xo_seed
     def _next_seed(self, seed):
         return (self.a * seed + self.c) % self.m 
@@ -83,42 +346,103 @@ class LinealCongruence(Congruences):
         return cond1 and cond2 and cond3
   
          
-    # Detecta el período con Floyd, limitado por max_steps.
-    # Si Hull-Dobell se cumple, devuelve m directamente.
-    # Si no cumple y se exceden max_steps, devuelve un estimado.
-        
-    def get_period(self, max_steps=10**6):
-        if self.hull_dobell_validation():
-            return self.m  # periodo máximo garantizado
-        start_seed = self.xo_seed
-        tortoise = self._next_seed(start_seed)
-        hare = self._next_seed(self._next_seed(start_seed))
-
-        steps = 0
-        while tortoise != hare and steps < max_steps:
-            tortoise = self._next_seed(tortoise)
-            hare = self._next_seed(self._next_seed(hare))
-            steps += 1
-
-        if steps >= max_steps:
-            # En vez de devolver un string, devolvemos el límite como int
-            return max_steps
-
-        # Colisión → calcular periodo exacto
-        mu = 0
-        tortoise = start_seed
-        while tortoise != hare:
-            tortoise = self._next_seed(tortoise)
-            hare = self._next_seed(hare)
-            mu += 1
-
-        lam = 1
-        hare = self._next_seed(tortoise)
-        while tortoise != hare:
-            hare = self._next_seed(hare)
-            lam += 1
-
-        return lam
+    # Calcula el período exacto de la semilla actual en O(log m).
+    # Como a = 1 + 2k es impar, el mapa es una biyección módulo m = 2^g y toda
+    # órbita es un ciclo de longitud 2^j. Tras n pasos:
+    #   x_n - x_0 = S_n * ((a-1)*x_0 + c),   S_n = 1 + a + ... + a^(n-1)
+    # así que el período es el menor 2^j con 2^g | S_(2^j) * ((a-1)*x_0 + c).
+    # S_(2^(j+1)) = S_(2^j) * (1 + a^(2^j)), por lo que bastan g iteraciones.
+    def get_period(self):
+        d = ((self.a - 1) * self.xo_seed + self.c) % self.m
+        s_n, a_n = 1, self.a % self.m
+        period = 1
+        while (s_n * d) % self.m != 0:
+            s_n = (s_n * (1 + a_n)) % self.m
+            a_n = (a_n * a_n) % self.m
+            period *= 2
+        return period
+
+
+
+# Motor de L carriles (lanes) de la misma recurrencia (a, c, m) en un solo arreglo.
+# El carril i arranca en la posición 1 + i*spacing del flujo y en cada paso todos
+# los carriles avanzan 'stride' posiciones con una sola operación vectorizada.
+#   order="stream"      -> spacing=1, stride=L: las filas salen en el orden original
+#                          del flujo (idéntico a LinealCongruence.next()).
+#   order="interleaved" -> carriles separados 'spacing' posiciones (por defecto m/L)
+#                          y stride=1: cada fila trae un valor de cada subflujo.
+class MultiLaneCongruence(Congruences):
+
+    def __init__(self, xo_seed, k, c, g, lanes=1024, order="stream", spacing=None):
+        super().__init__(xo_seed, g)
+        if self.m > 2**64:
+            raise ValueError("El motor de carriles solo soporta g <= 64")
+        if lanes <= 0:
+            raise ValueError("lanes debe ser mayor a 0")
+        self.k = k
+        self.g = g
+        self.a = 1 + 2 * k
+        self.c = c
+        self.lanes = lanes
+        self.order = order
+        if order == "stream":
+            self.spacing, stride = 1, lanes
+        elif order == "interleaved":
+            self.spacing, stride = spacing or max(1, self.m // lanes), 1
+        else:
+            raise ValueError(f"Orden desconocido: {order}")
+
+        # Semillas de cada carril separadas por saltos de 'spacing'
+        space_a, space_c = _affine_jump(self.a, self.c, self.m, self.spacing)
+        seed = (self.a * xo_seed + self.c) % self.m
+        seeds = np.empty(lanes, dtype=np.uint64)
+        for i in range(lanes):
+            seeds[i] = seed
+            seed = (space_a * seed + space_c) % self.m
+        self._lanes = seeds
+
+        step_a, step_c = _affine_jump(self.a, self.c, self.m, stride)
+        self._step_a = np.uint64(step_a)
+        self._step_c = np.uint64(step_c)
+        self._mask = np.uint64(self.m - 1)
+        # Valores de la última fila que aún no se han entregado
+        self._pending = np.empty(0, dtype=np.uint64)
+
+    # Genera n estados Xi; cada fila de la matriz es un paso de todos los carriles
+    def generate_states_block(self, n):
+        taken = min(n, self._pending.size)
+        head, self._pending = self._pending[:taken], self._pending[taken:]
+        rows = -(-(n - taken) // self.lanes)
+
+        matrix = np.empty((rows, self.lanes), dtype=np.uint64)
+        lanes = self._lanes
+        for r in range(rows):
+            matrix[r] = lanes
+            np.multiply(lanes, self._step_a, out=lanes)
+            lanes += self._step_c
+            lanes &= self._mask
+
+        body = matrix.ravel()
+        self._pending = np.concatenate((self._pending, body[n - taken:]))
+        states = np.concatenate((head, body[:n - taken]))
+        if n > 0:
+            self.xo_seed = int(states[-1])
+        return states
+
+    # Genera n valores en el modo de salida pedido (ver OUTPUT_MODES)
+    def generate_block(self, n, output="legacy"):
+        return _convert_states(self.generate_states_block(n), self.m, output)
+
+    # Genera el siguiente número Ri (modo legacy)
+    def next(self):
+        return float(self.generate_block(1)[0])
+
+    def generate_sequence(self, n):
+        return self.generate_block(n).tolist()
+
+    # Los carriles comparten (a, c, m), así que la validación es la del LCG
+    def hull_dobell_validation(self):
+        return LinealCongruence(self.xo_seed, self.k, self.c, self.g).hull_dobell_validation()
 
     
 # Clase de congruencia Aditiva
@@ -0,0 +1,79 @@
+from generators.Congruences import LinealCongruence
+
+
+# Análisis de la estructura de ciclos de x -> (a*x + c) mod m para TODAS las semillas.
+#
+# Con m = 2^g y a impar el mapa es una biyección: no hay colas (tail = 0) y cada
+# semilla está en un ciclo de longitud 2^j. El período de x solo depende de la
+# valuación 2-ádica t = v2((a-1)*x + c mod m), por eso las semillas se agrupan en
+# a lo sumo g+1 clases cuyo tamaño se obtiene en forma cerrada, sin recorrer semillas.
+class CycleAnalyzer:
+
+    def __init__(self, generator):
+        if not isinstance(generator, LinealCongruence):
+            raise TypeError("El analizador requiere un generador congruencial")
+        self.a = generator.a % generator.m
+        self.c = generator.c % generator.m
+        self.m = generator.m
+        self.g = generator.m.bit_length() - 1
+
+    # Valuación 2-ádica de x (g si x es 0 módulo m)
+    def _valuation(self, x):
+        x %= self.m
+        if x == 0:
+            return self.g
+        return (x & -x).bit_length() - 1
+
+    # Período de las semillas con v2((a-1)*x + c) = t: menor 2^j con 2^g | S_(2^j) * 2^t
+    def _period_for_valuation(self, t):
+        s_n, a_n = 1, self.a
+        period = 1
+        while (s_n << t) % self.m != 0:
+            s_n = (s_n * (1 + a_n)) % self.m
+            a_n = (a_n * a_n) % self.m
+            period *= 2
+        return period
+
+    # Cantidad de semillas x en [0, m) con (a-1)*x + c ≡ 0 mod 2^t.
+    # La congruencia tiene solución si 2^min(u, t) divide a c (u = v2(a-1)),
+    # con 2^min(u, t) soluciones módulo 2^t.
+    def _count_divisible(self, t):
+        if t == 0:
+            return self.m
+        if self.a == 1:
+            return self.m if self.c % (1 << t) == 0 else 0
+        u = min(self._valuation(self.a - 1), t)
+        if self.c % (1 << u) != 0:
+            return 0
+        return (1 << u) * (self.m >> t)
+
+    # Devuelve una fila por clase de semillas:
+    # valuación t, período, cola, cantidad de semillas y cantidad de ciclos.
+    def analyze(self):
+        classes = []
+        for t in range(self.g + 1):
+            seeds = self._count_divisible(t)
+            if t < self.g:
+                seeds -= self._count_divisible(t + 1)
+            if seeds == 0:
+                continue
+            period = self._period_for_valuation(t)
+            classes.append({
+                "valuation": t,
+                "period": period,
+                "tail": 0,
+                "seeds": seeds,
+                "cycles": seeds // period,
+            })
+        return classes
+
+    # Histograma {período: cantidad de semillas}
+    def period_histogram(self):
+        histogram = {}
+        for row in self.analyze():
+            histogram[row["period"]] = histogram.get(row["period"], 0) + row["seeds"]
+        return dict(sorted(histogram.items()))
+
+    # Clase (valuación t) a la que pertenece una semilla concreta
+    def seed_class(self, seed):
+        return self._valuation((self.a - 1) * seed + self.c)
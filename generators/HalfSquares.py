@@ -1,9 +1,203 @@
+from functools import lru_cache
+
+import numpy as np
+
+# Potencias de 10 representables en int64, para contar dígitos sin pasar por str
+_POW10 = 10 ** np.arange(19, dtype=np.int64)
+# Mayor semilla cuyo cuadrado cabe en int64
+_MAX_VECTOR_SEED = 3037000499
+
+
+def middle_digits(seed, digits=4):
+    """
+    Toma los 'digits' dígitos del medio de seed^2 con aritmética entera.
+    Para digits=4 equivale a str(seed ** 2).zfill(8)[2:6]: el cuadrado se completa
+    a 2*digits dígitos y, si tiene más, el corte se cuenta desde la izquierda.
+    """
+    square = seed * seed
+    length = 2 * digits
+    while square >= 10 ** length:
+        length += 1
+    return (square // 10 ** (length - digits - digits // 2)) % 10 ** digits
+
+
+def middle_digits_array(seeds, digits=4):
+    """Versión vectorizada de middle_digits: avanza muchas semillas a la vez."""
+    seeds = np.asarray(seeds)
+    if seeds.size and (2 * digits > 18 or np.abs(seeds).max() > _MAX_VECTOR_SEED):
+        # El cuadrado no cabe en int64: se usa aritmética entera de Python
+        step = np.frompyfunc(lambda x: middle_digits(int(x), digits), 1, 1)
+        return step(seeds).astype(np.int64)
+    seeds = seeds.astype(np.int64)
+    square = seeds * seeds
+    length = np.maximum(2 * digits, np.searchsorted(_POW10, square, side="right"))
+    return (square // _POW10[length - digits - digits // 2]) % 10 ** digits
+
+
+def ri_array(xi, digits=4):
+    """Ri = Xi / 10^digits truncado a 5 decimales, igual que HalfSquares._truncate."""
+    ri = np.asarray(xi, dtype=np.int64) / 10 ** digits
+    ri *= 10**5
+    np.trunc(ri, out=ri)
+    ri /= 10**5
+    return ri
+
+
+def brent_cycle(seed, digits, max_limit):
+    """
+    Estructura de la órbita de una semilla de cualquier ancho con el algoritmo de
+    Brent: memoria O(1) en vez de un set de estados visitados.
+    Devuelve (mu, lam, entrada): largo de la cola, largo del ciclo y primer estado
+    del ciclo; o None si mu + lam supera max_limit.
+    """
+    # Si mu + lam <= max_limit, Brent lo detecta en menos de 4*(max_limit+1) pasos
+    budget = 4 * (max_limit + 1)
+    # Longitud del ciclo (lam)
+    power = lam = 1
+    tortoise, hare = seed, middle_digits(seed, digits)
+    while tortoise != hare:
+        budget -= 1
+        if lam > max_limit or budget < 0:
+            return None
+        if power == lam:
+            tortoise, power, lam = hare, power * 2, 0
+        hare = middle_digits(hare, digits)
+        lam += 1
+    # Inicio del ciclo (mu)
+    tortoise = hare = seed
+    for _ in range(lam):
+        hare = middle_digits(hare, digits)
+    mu = 0
+    while tortoise != hare:
+        tortoise, hare = middle_digits(tortoise, digits), middle_digits(hare, digits)
+        mu += 1
+    return mu, lam, tortoise
+
+
+def brent_period(seed, digits, max_limit):
+    """
+    Periodo de una semilla de cualquier ancho: estados distintos antes de
+    repetirse o llegar a 0, con tope max_limit.
+    """
+    if seed == 0:
+        return 0
+    orbit = brent_cycle(seed, digits, max_limit)
+    if orbit is None:
+        return max_limit
+    mu, lam, entry = orbit
+    # Si el ciclo es el punto fijo 0, solo cuentan los estados previos
+    count = mu if entry == 0 else mu + lam
+    return min(count, max_limit)
+
+
+# Cantidad de estados posibles de 4 dígitos (0000..9999)
+STATES = 10000
+
+
+@lru_cache(maxsize=1)
+def transition_table():
+    """Arreglo T con T[x] = siguiente semilla de x, para todos los estados de 4 dígitos."""
+    table = middle_digits_array(np.arange(STATES))
+    table.flags.writeable = False
+    return table
+
+
+@lru_cache(maxsize=1)
+def cycle_map():
+    """
+    Análisis del grafo funcional x -> T[x] sobre los 10^4 estados.
+    Devuelve tres arreglos indexados por estado:
+        tail     -> pasos hasta entrar a un ciclo.
+        cycle    -> longitud del ciclo terminal.
+        terminal -> representante (menor estado) del ciclo terminal.
+    """
+    table = transition_table().tolist()
+    tail = np.zeros(STATES, dtype=np.int64)
+    cycle = np.zeros(STATES, dtype=np.int64)
+    terminal = np.zeros(STATES, dtype=np.int64)
+    # 0 = sin visitar, 1 = en el camino actual, 2 = resuelto
+    status = [0] * STATES
+    position = [0] * STATES
+
+    for start in range(STATES):
+        if status[start]:
+            continue
+        path = []
+        x = start
+        while status[x] == 0:
+            status[x] = 1
+            position[x] = len(path)
+            path.append(x)
+            x = table[x]
+
+        if status[x] == 1:
+            # El camino se cerró sobre sí mismo: ciclo nuevo
+            loop = path[position[x]:]
+            length, representative = len(loop), min(loop)
+            for node in loop:
+                cycle[node], terminal[node], status[node] = length, representative, 2
+            path = path[:position[x]]
+            steps = 0
+        else:
+            length, representative, steps = int(cycle[x]), int(terminal[x]), int(tail[x])
+
+        for node in reversed(path):
+            steps += 1
+            tail[node], cycle[node], terminal[node], status[node] = steps, length, representative, 2
+
+    for arr in (tail, cycle, terminal):
+        arr.flags.writeable = False
+    return tail, cycle, terminal
+
+
+def table_period(seed):
+    """
+    Periodo de una semilla de 4 dígitos en O(1): estados distintos recorridos
+    antes de repetirse o llegar a 0 (mismo criterio que HalfSquares.get_period).
+    """
+    tail, cycle, terminal = cycle_map()
+    if seed == 0:
+        return 0
+    if terminal[seed] == 0:
+        # Colapsa en 0: solo cuentan los estados antes de llegar a 0
+        return int(tail[seed])
+    return int(tail[seed] + cycle[seed])
+
+
+def table_trajectory(seed, n):
+    """
+    Devuelve los n estados siguientes a una semilla de 4 dígitos por indexación
+    de tabla: se recorre la cola y un ciclo, y el resto se repite con índices.
+    """
+    tail, cycle, _ = cycle_map()
+    table = transition_table().tolist()
+    rho = int(tail[seed] + cycle[seed])
+    orbit = [seed]
+    for _ in range(min(n, rho)):
+        orbit.append(table[orbit[-1]])
+    orbit = np.array(orbit, dtype=np.int64)
+    if n <= rho:
+        return orbit[1:]
+    start, length = int(tail[seed]), int(cycle[seed])
+    steps = np.arange(rho + 1, n + 1)
+    return np.concatenate((orbit[1:], orbit[start + (steps - start) % length]))
+
+
 class HalfSquares:
     
-    def __init__(self, seed, n):
+    def __init__(self, seed, n, digits=None):
         self.seed = seed
         self.n = n
+        # Ancho par de la semilla; por defecto se deduce de la semilla (mínimo 4)
+        if digits is None:
+            digits = max(4, len(str(abs(seed))))
+            digits += digits % 2
+        if digits < 2 or digits % 2:
+            raise ValueError("digits debe ser un entero par mayor o igual a 2")
+        self.digits = digits
         self.sequence = []
+        # Posición en la secuencia: cantidad de números generados desde la semilla inicial
+        self.offset = 0
 
     def _truncate(self, value, decimals=5):
         """Trunca un número flotante a la cantidad de decimales indicada."""
@@ -14,37 +208,102 @@ class HalfSquares:
         """
         Genera el siguiente número usando el método de cuadrados medios.
         Devuelve:
-            xi -> Xi como string de 4 dígitos relleno con ceros si se necesita.
+            xi -> Xi como string de 'digits' dígitos relleno con ceros si se necesita.
             ri -> Ri truncado a 5 decimales como string.
         """
-        # Elevar al cuadrado y asegurar los 8 dígitos
-        x_squared = str(self.seed ** 2).zfill(8)
+        xi, ri = self.next_value()
+        return f"{xi:0{self.digits}d}", f"{ri:.5f}"
 
-        # Tomar los 4 dígitos del medio
-        mid_digits = x_squared[2:6]
-        xi = mid_digits  # Xi   con 4 dígitos
-        self.seed = int(mid_digits)
+    def next_value(self):
+        """
+        Igual que next() pero con aritmética entera y valores numéricos.
+        Devuelve:
+            xi -> Xi como entero.
+            ri -> Ri truncado a 5 decimales como float.
+        """
+        self.seed = middle_digits(self.seed, self.digits)
+        self.offset += 1
+        return self.seed, self._truncate(self.seed / 10 ** self.digits, 5)
 
-        # Normalizar y truncar a 5 decimales
-        ri = self._truncate(self.seed / 10000, 5)
+    def generate_array(self, n):
+        """
+        Genera n valores como arreglos NumPy (Xi int64, Ri float64) sin
+        formatear strings; el estado queda igual que tras n llamadas a next().
+        """
+        if n == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        if self.digits != 4:
+            xi = np.empty(n, dtype=np.int64)
+            seed = self.seed
+            for i in range(n):
+                seed = middle_digits(seed, self.digits)
+                xi[i] = seed
+        elif 0 <= self.seed < STATES:
+            xi = table_trajectory(self.seed, n)
+        else:
+            # Semilla fuera de la tabla: el primer paso la reduce a 4 dígitos
+            first = middle_digits(self.seed)
+            xi = np.concatenate(([first], table_trajectory(first, n - 1)))
+        self.seed = int(xi[-1])
+        self.offset += n
+        return xi, ri_array(xi, self.digits)
 
-        return xi, f"{ri:.5f}"
+    @staticmethod
+    def generate_many(seeds, n, digits=4):
+        """
+        Avanza muchas semillas a la vez: devuelve matrices (n, len(seeds)) de Xi y Ri
+        donde la columna j es la secuencia de la semilla seeds[j].
+        """
+        current = np.asarray(seeds, dtype=np.int64)
+        xi = np.empty((n, current.size), dtype=np.int64)
+        for i in range(n):
+            current = middle_digits_array(current, digits)
+            xi[i] = current
+        return xi, ri_array(xi, digits)
 
     def get_period(self, max_limit=100000):
         """
         Calcula el periodo antes de repetirse o llegar a 0.
         max_limit evita ciclos infinitos (por defecto 100000).
+        Con 4 dígitos usa el mapa de ciclos precalculado (consulta O(1)); con
+        otros anchos usa el algoritmo de Brent, de memoria constante.
         """
-        seen = set()
-        count = 0
-        temp_seed = self.seed
+        if self.digits != 4:
+            return brent_period(self.seed, self.digits, max_limit)
+        seed, extra = self.seed, 0
+        if not 0 <= seed < STATES:
+            # Una semilla de más de 4 dígitos no puede repetirse: cuenta un paso
+            seed, extra = middle_digits(seed), 1
+        return min(extra + table_period(seed), max_limit)
 
-        while count < max_limit:
-            if temp_seed in seen or temp_seed == 0:
-                break
-            seen.add(temp_seed)
-            x_squared = str(temp_seed ** 2).zfill(8)
-            temp_seed = int(x_squared[2:6])
-            count += 1
+    def zero_collapse(self, max_limit=100000):
+        """
+        Paso en el que la secuencia cae en 0 (y se queda ahí), contando desde la
+        semilla actual; None si nunca colapsa dentro de max_limit pasos.
+        """
+        if self.seed == 0:
+            return 0
+        if self.digits != 4:
+            orbit = brent_cycle(self.seed, self.digits, max_limit)
+            if orbit is None or orbit[2] != 0:
+                return None
+            return orbit[0]
+        seed, extra = self.seed, 0
+        if not 0 <= seed < STATES:
+            seed, extra = middle_digits(seed), 1
+        tail, _, terminal = cycle_map()
+        if terminal[seed] != 0 or extra + tail[seed] > max_limit:
+            return None
+        return extra + int(tail[seed])
 
-        return count
+    def getstate(self):
+        """Estado completo: semilla actual, n, posición en la secuencia y ancho."""
+        return ("HalfSquares", self.seed, self.n, self.offset, self.digits)
+
+    def setstate(self, state):
+        """Restaura un estado devuelto por getstate() sin regenerar la secuencia."""
+        if state[0] != "HalfSquares":
+            raise ValueError(f"El estado es de {state[0]}, no de HalfSquares")
+        _, seed, n, offset, digits = state
+        self.seed, self.n, self.offset, self.digits = seed, n, offset, digits
+        self.sequence = []
@@ -0,0 +1,108 @@
+"""
+Análisis por lotes de semillas para el método de cuadrados medios.
+
+Para cada semilla de un archivo de parámetros (p. ej. params_examples/seeds_50.txt)
+calcula el periodo, el paso en el que la secuencia colapsa en 0 y el veredicto de
+la batería de pruebas de RandomTestFacade, y escribe todo en una sola tabla CSV.
+
+Uso:
+    python -m generators.HalfSquaresBatch params_examples/seeds_50.txt resultados.csv
+"""
+
+import csv
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from generators.HalfSquares import HalfSquares
+from generators.test.RandomTest import RandomTestFacade
+from utils.param_loader import load_param_file
+
+TEST_NAMES = ["Mean", "Variance", "Chi-Square", "Kolmogorov-Smirnov", "Poker", "Runs"]
+COLUMNS = ["Seed", "Digits", "Period", "ZeroStep", "n"] + TEST_NAMES + ["Verdict"]
+
+
+def analyze_seed(seed, n=100, error=0.05, max_limit=100000):
+    """
+    Analiza una semilla: periodo, colapso en 0 y pruebas sobre min(n, periodo) Ri.
+    Devuelve un diccionario con las columnas de COLUMNS.
+    """
+    generator = HalfSquares(seed, n)
+    period = generator.get_period(max_limit)
+    zero_step = generator.zero_collapse(max_limit)
+    length = min(n, period)
+    _, ri = generator.generate_array(length)
+
+    row = {
+        "Seed": seed,
+        "Digits": generator.digits,
+        "Period": period,
+        "ZeroStep": "" if zero_step is None else zero_step,
+        "n": length,
+    }
+    if length < 2:
+        # Con menos de 2 valores las pruebas no se pueden evaluar
+        row.update({name: "NO PASA" for name in TEST_NAMES})
+        row["Verdict"] = "NO PASA"
+        return row
+
+    results, passed = RandomTestFacade(error).run_all(ri.tolist())
+    for name in TEST_NAMES:
+        row[name] = results[name]["passed"]
+    row["Verdict"] = "PASA" if passed else "NO PASA"
+    return row
+
+
+def _analyze_pair(pair, error, max_limit):
+    seed, n = pair
+    return analyze_seed(seed, n, error, max_limit)
+
+
+def analyze_seeds(seeds, n=100, error=0.05, max_limit=100000, workers=None):
+    """
+    Analiza una lista de semillas. 'n' puede ser un entero o una lista con un n
+    por semilla. Con workers > 1 las semillas se reparten en un pool de procesos.
+    """
+    sizes = n if isinstance(n, (list, tuple)) else [n] * len(seeds)
+    pairs = list(zip(seeds, sizes))
+    task = partial(_analyze_pair, error=error, max_limit=max_limit)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(pairs) < 2:
+        return [task(pair) for pair in pairs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(task, pairs, chunksize=max(1, len(pairs) // (4 * workers))))
+
+
+def write_results(rows, file_path):
+    """Escribe la tabla de resultados en CSV."""
+    with open(file_path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def analyze_seed_file(file_path, output_path=None, n=100, error=0.05, max_limit=100000, workers=None):
+    """
+    Carga las semillas con load_param_file (columna 'Seed' y, opcional, 'n'),
+    las analiza todas y, si se indica output_path, escribe la tabla en CSV.
+    """
+    params = [row for row in load_param_file(file_path) if isinstance(row.get("Seed"), int)]
+    if not params:
+        raise ValueError("El archivo no tiene semillas válidas en la columna 'Seed'")
+    seeds = [row["Seed"] for row in params]
+    sizes = [row.get("n", n) for row in params]
+    rows = analyze_seeds(seeds, sizes, error, max_limit, workers)
+    if output_path:
+        write_results(rows, output_path)
+    return rows
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Uso: python -m generators.HalfSquaresBatch <archivo_semillas> [salida.csv]")
+        sys.exit(1)
+    output = sys.argv[2] if len(sys.argv) > 2 else "halfsquares_batch.csv"
+    results = analyze_seed_file(sys.argv[1], output)
+    passed = sum(row["Verdict"] == "PASA" for row in results)
+    print(f"{len(results)} semillas analizadas ({passed} PASA). Resultados en {output}")
@@ -0,0 +1,255 @@
+import math
+from functools import lru_cache
+
+import numpy as np
+
+from generators.Congruences import Congruences, LinealCongruence, OUTPUT_MODES, _BLOCK_SIZE
+
+
+# Parámetros de MRG32k3a (L'Ecuyer, 1999). Período aproximado 2^191.
+M1 = 4294967087
+M2 = 4294944443
+_A12 = 1403580
+_A13N = 810728
+_A21 = 527612
+_A23N = 1370589
+_NORM = 2.328306549295727688e-10  # 1 / (M1 + 1)
+
+# Matrices de transición de cada componente: (x_{n-2}, x_{n-1}, x_n) = A * (x_{n-3}, x_{n-2}, x_{n-1})
+_A1 = ((0, 1, 0), (0, 0, 1), ((-_A13N) % M1, _A12, 0))
+_A2 = ((0, 1, 0), (0, 0, 1), ((-_A23N) % M2, 0, _A21))
+
+
+def _mat_mul(a, b, m):
+    return tuple(
+        tuple(sum(a[i][k] * b[k][j] for k in range(3)) % m for j in range(3))
+        for i in range(3)
+    )
+
+
+def _mat_vec(a, v, m):
+    return tuple(sum(a[i][k] * v[k] for k in range(3)) % m for i in range(3))
+
+
+# Potencia de una matriz 3x3 por cuadrados repetidos
+def _mat_pow(a, e, m):
+    result = ((1, 0, 0), (0, 1, 0), (0, 0, 1))
+    while e > 0:
+        if e & 1:
+            result = _mat_mul(a, result, m)
+        a = _mat_mul(a, a, m)
+        e >>= 1
+    return result
+
+
+# Matrices de salto precalculadas: subflujos de 2^76 valores y flujos de 2^127
+_A1_SUBSTREAM = _mat_pow(_A1, 2**76, M1)
+_A2_SUBSTREAM = _mat_pow(_A2, 2**76, M2)
+_A1_STREAM = _mat_pow(_A1, 2**127, M1)
+_A2_STREAM = _mat_pow(_A2, 2**127, M2)
+
+
+# Coeficientes del modo por bloques: fila 3 de A^j para j = 1.._BLOCK_SIZE, de modo
+# que el j-ésimo valor tras un estado s es (A^j)[2] · s. También devuelve A^_BLOCK_SIZE
+# para pasar de una fila de bloques a la siguiente. Se calcula una sola vez y los
+# bloques más cortos usan coefs[:n].
+@lru_cache(maxsize=None)
+def _coefficient_tables():
+    tables = []
+    for base, m in ((_A1, M1), (_A2, M2)):
+        coefs = np.empty((_BLOCK_SIZE, 3), dtype=np.uint64)
+        power = base
+        for j in range(_BLOCK_SIZE):
+            coefs[j] = power[2]
+            power = _mat_mul(base, power, m)
+        coefs.flags.writeable = False
+        tables.append(coefs)
+    return tables[0], tables[1], _mat_pow(_A1, _BLOCK_SIZE, M1), _mat_pow(_A2, _BLOCK_SIZE, M2)
+
+
+# Combina x1 - x2 de cada componente con (A^j)[2] · s, todo en uint64.
+# Cada producto es < 2^64 porque coeficientes y estados son < 2^32.
+def _combine(starts, coefs, m):
+    acc = np.zeros((starts.shape[0], coefs.shape[0]), dtype=np.uint64)
+    modulus = np.uint64(m)
+    for k in range(3):
+        term = np.multiply.outer(starts[:, k], coefs[:, k])
+        term %= modulus
+        acc += term
+    acc %= modulus
+    return acc
+
+
+# Convierte los valores z = (x1 - x2) mod M1 al modo de salida pedido
+def _convert_z(z, output):
+    if output not in OUTPUT_MODES:
+        raise ValueError(f"Modo de salida desconocido: {output}")
+    if output in ("uint32", "uint64"):
+        return z.astype(OUTPUT_MODES[output])
+    if output == "float32":
+        # 24 bits altos: siempre en [0, 1) también en float32
+        ri = (z >> np.uint64(8)).astype(np.float32)
+        ri *= np.float32(2.0 ** -24)
+        return ri
+    ri = np.where(z > 0, z, np.uint64(M1)).astype(np.float64)
+    ri *= _NORM
+    if output == "legacy":
+        ri *= 10**5
+        np.trunc(ri, out=ri)
+        ri /= 10**5
+    return ri
+
+
+# Generador combinado de recursión múltiple MRG32k3a con flujos y subflujos.
+# Misma interfaz que los generadores congruenciales: next() devuelve Ri con
+# 5 decimales y generate_block(n, output) admite todos los modos de OUTPUT_MODES.
+class MRG32k3a(Congruences):
+
+    def __init__(self, seed=12345, stream=0, substream=0):
+        self.m = M1
+        self.xo_seed = seed if isinstance(seed, int) else tuple(int(x) for x in seed)
+        # Posición dentro del subflujo actual
+        self.offset = 0
+        state = self._expand_seed(seed)
+        self._stream_start = state
+        self.jump_stream(stream)
+        self.jump_substream(substream)
+
+    # Una semilla entera se expande a los 6 componentes con el LCG del proyecto;
+    # también se acepta directamente una secuencia de 6 enteros.
+    @staticmethod
+    def _expand_seed(seed):
+        if isinstance(seed, int):
+            lcg = LinealCongruence(xo_seed=seed, k=551757622, c=12345, g=31)
+            components = lcg.generate_block(6, "uint64").tolist()
+        else:
+            components = [int(x) for x in seed]
+        if len(components) != 6:
+            raise ValueError("La semilla de MRG32k3a debe tener 6 componentes")
+        s1, s2 = tuple(components[:3]), tuple(components[3:])
+        if any(x >= M1 for x in s1) or any(x >= M2 for x in s2):
+            raise ValueError("Componentes de la semilla fuera de rango")
+        if not any(s1) or not any(s2):
+            raise ValueError("Cada componente de la semilla necesita al menos un valor distinto de 0")
+        return s1, s2
+
+    # Para MRG32k3a no aplica Hull-Dobell: se valida que el estado sea admisible
+    def hull_dobell_validation(self):
+        s1, s2 = self._s1, self._s2
+        return any(s1) and any(s2) and all(x < M1 for x in s1) and all(x < M2 for x in s2)
+
+    # Genera el siguiente número Ri
+    def next(self):
+        s10, s11, s12 = self._s1
+        s20, s21, s22 = self._s2
+        p1 = (_A12 * s11 - _A13N * s10) % M1
+        p2 = (_A21 * s22 - _A23N * s20) % M2
+        self._s1 = (s11, s12, p1)
+        self._s2 = (s21, s22, p2)
+        self.offset += 1
+        z = (p1 - p2) % M1
+        ri = (z if z > 0 else M1) * _NORM
+        return math.trunc(ri * 10**5) / 10**5
+
+    # Genera n valores z = (x1 - x2) mod M1 como arreglo uint64, por bloques
+    def generate_states_block(self, n):
+        if n <= 0:
+            return np.empty(0, dtype=np.uint64)
+        coefs1, coefs2, jump1, jump2 = _coefficient_tables()
+        # Con una sola fila (n <= _BLOCK_SIZE) no hace falta saltar entre filas
+        block = min(n, _BLOCK_SIZE)
+        coefs1, coefs2 = coefs1[:block], coefs2[:block]
+        rows = -(-n // block)
+
+        starts1 = np.empty((rows, 3), dtype=np.uint64)
+        starts2 = np.empty((rows, 3), dtype=np.uint64)
+        s1, s2 = self._s1, self._s2
+        for r in range(rows):
+            if r:
+                s1 = _mat_vec(jump1, s1, M1)
+                s2 = _mat_vec(jump2, s2, M2)
+            starts1[r] = s1
+            starts2[r] = s2
+
+        x1 = _combine(starts1, coefs1, M1).ravel()[:n]
+        x2 = _combine(starts2, coefs2, M2).ravel()[:n]
+        # z = (x1 - x2) mod M1 sin salir de uint64
+        z = x1 + np.uint64(M1)
+        z -= x2
+        z %= np.uint64(M1)
+
+        # El estado final son los tres últimos valores de cada componente
+        if n >= 3:
+            self._s1 = tuple(int(x) for x in x1[n - 3:])
+            self._s2 = tuple(int(x) for x in x2[n - 3:])
+            self.offset += n
+        else:
+            self.advance(n)
+        return z
+
+    # Genera n valores en el modo de salida pedido (ver OUTPUT_MODES)
+    def generate_block(self, n, output="legacy"):
+        return _convert_z(self.generate_states_block(n), output)
+
+    def generate_sequence(self, n):
+        return self.generate_block(n).tolist()
+
+    # Avanza 'steps' posiciones en O(log steps) con potencias de las matrices
+    def advance(self, steps):
+        if steps < 0:
+            raise ValueError("steps debe ser un entero no negativo")
+        self._s1 = _mat_vec(_mat_pow(_A1, steps, M1), self._s1, M1)
+        self._s2 = _mat_vec(_mat_pow(_A2, steps, M2), self._s2, M2)
+        self.offset += steps
+
+    # Alias de advance()
+    def jump(self, steps):
+        return self.advance(steps)
+
+    # Avanza 'count' flujos (2^127 valores) desde el inicio del flujo actual
+    def jump_stream(self, count=1):
+        s1, s2 = self._stream_start
+        for _ in range(count):
+            s1 = _mat_vec(_A1_STREAM, s1, M1)
+            s2 = _mat_vec(_A2_STREAM, s2, M2)
+        self._stream_start = (s1, s2)
+        self.reset_stream()
+
+    # Avanza 'count' subflujos (2^76 valores) desde el inicio del subflujo actual
+    def jump_substream(self, count=1):
+        s1, s2 = self._substream_start
+        for _ in range(count):
+            s1 = _mat_vec(_A1_SUBSTREAM, s1, M1)
+            s2 = _mat_vec(_A2_SUBSTREAM, s2, M2)
+        self._substream_start = (s1, s2)
+        self._s1, self._s2 = s1, s2
+        self.offset = 0
+
+    # Vuelve al inicio del flujo actual
+    def reset_stream(self):
+        self._substream_start = self._stream_start
+        self._s1, self._s2 = self._stream_start
+        self.offset = 0
+
+    # Vuelve al inicio del subflujo actual
+    def reset_substream(self):
+        self._s1, self._s2 = self._substream_start
+        self.offset = 0
+
+    # Estado completo: semilla, estado actual, inicios de flujo/subflujo y posición.
+    # Ver utils/checkpoint.py para guardarlo en formato binario.
+    def getstate(self):
+        return ("MRG32k3a", self.xo_seed, (self._s1, self._s2),
+                self._stream_start, self._substream_start, self.offset)
+
+    # Restaura un estado devuelto por getstate() en O(1)
+    def setstate(self, state):
+        if state[0] != "MRG32k3a":
+            raise ValueError(f"El estado es de {state[0]}, no de MRG32k3a")
+        _, xo_seed, current, stream_start, substream_start, offset = state
+        self.m = M1
+        self.xo_seed = xo_seed
+        self._s1, self._s2 = current
+        self._stream_start = stream_start
+        self._substream_start = substream_start
+        self.offset = offset
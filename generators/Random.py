@@ -2,19 +2,25 @@
 Random — envoltura (facade) para generación de números pseudoaleatorios.
 
 Resumen rápido:
-- Esta clase centraliza generación de Ri con un LCG (LinealCongruence),
-  transformaciones a distribuciones (uniforme y normal) y validación
-  estadística de las secuencias con RandomTestFacade.
-- La semilla se genera dinámicamente en cada llamada usando time.time_ns(),
-  por eso cada llamada produce secuencias distintas.
-- Si una secuencia no pasa las pruebas estadísticas, se regenera con otra semilla
-  hasta que pase (ten cuidado con bucles infinitos / rendimiento).
+- Esta clase centraliza generación de Ri con un LCG (LinealCongruence) o MRG32k3a,
+  transformaciones a distribuciones (uniforme, normal, discreta, Poisson, binomial,
+  gamma y beta) y validación estadística de las secuencias con RandomTestFacade.
+- Cada instancia tiene UN motor (generador de Ri) persistente, sembrado una sola vez
+  con time.time_ns() al crearla: todas las llamadas consumen el mismo flujo, así que
+  llamadas seguidas nunca repiten ni solapan valores.
+- Si una secuencia no pasa las pruebas estadísticas, se descarta y se toman los
+  siguientes valores del flujo hasta que pase (ten cuidado con bucles infinitos / rendimiento).
 """
 
 import time
 import math
-from generators.Congruences import LinealCongruence
-from distributions.Distributions import UniformDistribution, NormalDistribution
+import numpy as np
+from distributions.Distributions import (UniformDistribution, NormalDistribution, PoissonDistribution,
+                                         BinomialDistribution, GammaDistribution, BetaDistribution,
+                                         make_ri_generator)
+from distributions.DiscreteDistribution import AliasTable, DiscreteDistribution
+from distributions.IntegerDistribution import IntegerDistribution
+from distributions.MultivariateNormal import MultivariateNormalDistribution
 from generators.test.RandomTest import RandomTestFacade
 
 
@@ -27,40 +33,43 @@ class Random:
       - error (float): nivel de significancia usado por RandomTestFacade.
                        Por defecto 0.05 (5%). Valores menores = pruebas más estrictas.
       - deterministic (bool): controla el modo de generación de semilla.
-            * True  → modo determinista: se genera UNA sola semilla al crear el objeto
-              y se reutiliza en todas las llamadas NO SE SI LO NECESITEN PERO AHI ESTA.
-            * False → modo dinámico: en cada llamada se genera una semilla distinta
-              basada en time.time_ns() hora exacta con nanosegundos (por defecto, comportamiento no repetible).
+            * True  → modo determinista: la semilla del motor se guarda en _fixed_seed
+              (y en getstate()), así la misma serie de llamadas se puede repetir con
+              reseed(_fixed_seed) NO SE SI LO NECESITEN PERO AHI ESTA.
+            * False → modo dinámico: la semilla sale de time.time_ns() hora exacta con
+              nanosegundos y no se guarda (por defecto, comportamiento no repetible).
+      - backend (str): generador de Ri usado por todas las llamadas.
+            * "lcg"      → congruencial lineal k=551757622, c=12345, g=31 (por defecto).
+            * "mrg32k3a" → generador combinado MRG32k3a, período ~2^191.
     Atributos privados:
       - self._fixed_seed: almacena la semilla fija en modo determinista.
+      - self._engine: generador de Ri compartido por todas las llamadas.
+      - self._normal_spare: z1 de Box-Muller guardado para la siguiente llamada
+        normal() de un solo valor (None si no hay).
     """
-    def __init__(self, error=0.05, deterministic=False):
+    def __init__(self, error=0.05, deterministic=False, backend="lcg"):
         self.error = error
+        self.backend = backend
         self.facade = RandomTestFacade(error)
 
         self.deterministic = deterministic
         self._fixed_seed = None
-
-        if deterministic:
-            # Guardamos una semilla fija para todo el ciclo de vida del objeto
-            self._fixed_seed = int(time.time_ns() % (2**31 - 1))
+        self.reseed()
 
     # ----------------------------
     # 0. Gestión de la semilla
     # ----------------------------
-    def _get_seed(self,failed_test=False):
+    def reseed(self, seed=None):
         """
-        Devuelve la semilla a usar:
-          - Si deterministic=True → devuelve la misma semilla cada vez.
-          - Si deterministic=False → devuelve una semilla dinámica basada en time.time_ns().
-          - Si failed_test=True (llamado tras fallo de test), fuerza semilla dinámica
+        Reinicia el motor persistente con 'seed' (None -> semilla basada en time.time_ns()).
+        En modo determinista la semilla queda guardada en _fixed_seed.
         """
-        # Si se llama desde un fallo de test, forzamos semilla dinámica
-        if failed_test:
-            return int(time.time_ns() % (2**31 - 1))
-        if self.deterministic and self._fixed_seed is not None:
-            return self._fixed_seed
-        return int(time.time_ns() % (2**31 - 1))
+        if seed is None:
+            seed = int(time.time_ns() % (2**31 - 1))
+        if self.deterministic:
+            self._fixed_seed = seed
+        self._engine = make_ri_generator(seed, self.backend)
+        self._normal_spare = None
     
     
     # ----------------------------
@@ -75,21 +84,16 @@ class Random:
               * None (por defecto) -> devuelve un único Ri (float en [0,1)).
               * entero > 0 -> devuelve una lista de n Ri.
         Comportamiento:
-          - La semilla depende del modo (determinista o dinámico).
+          - Los Ri salen del motor persistente, a continuación de la llamada anterior.
           - Si se pide una secuencia, se valida con RandomTestFacade. Si falla, se regenera.
-          - Si se pide un solo Ri, se devuelve directamente sin validación.
+          - Si se pide un solo Ri, se devuelve directamente sin validación (O(1)).
         """
-        seed = self._get_seed()
-        lcg = LinealCongruence(xo_seed=seed, k=551757622, c=12345, g=31)
-
         if n is None:
-            return lcg.next()
+            return self._engine.next()
         else:
-            sequence = lcg.generate_sequence(n)
+            sequence = self._engine.generate_sequence(n)
             while not self._validate_sequence(sequence):
-                seed = self._get_seed(failed_test=True)
-                lcg = LinealCongruence(xo_seed=seed, k=551757622, c=12345, g=31)
-                sequence = lcg.generate_sequence(n)
+                sequence = self._engine.generate_sequence(n)
             return sequence
 
 
@@ -104,28 +108,43 @@ class Random:
           - a (float/int): límite inferior.
           - b (float/int): límite superior.
           - n (int or None): cantidad de valores (None -> un solo valor).
-          - integer (bool): si True → devuelve enteros truncados, si False → floats.
+          - integer (bool): si True → devuelve enteros uniformes de [a, b) sin sesgo
+              (mismo motor que randint); si [a, b) no contiene enteros devuelve
+              floor(a). Si False → floats.
         """
-        seed = self._get_seed()
-
+        if integer:
+            low, high = math.ceil(a), math.ceil(b) - 1
+            if high < low:
+                # [a, b) no contiene enteros (p. ej. a == b o a = 0.2, b = 0.8): floor(a)
+                value = math.floor(a)
+                return value if n is None else [value] * n
+            values = self.randint(low, high, n)
+            return values if n is None else values.tolist()
         if n is None:
-            u = UniformDistribution(seed, 1, a, b)
-            seq = u.generate_uniform()
-            value = seq[0]
-            return int(math.trunc(value)) if integer else value
+            # Misma transformación que UniformDistribution, sin crear objetos
+            return a + (b - a) * self._engine.next()
         else:
-            u = UniformDistribution(seed, n, a, b)
+            u = UniformDistribution(self._engine, n, a, b, self.backend)
             seq = u.generate_uniform()
             while not self._validate_sequence(u.get_ri_sequence()):
-                seed = self._get_seed(failed_test=True)
-                u = UniformDistribution(seed, n, a, b)
                 seq = u.generate_uniform()
-            return [int(math.trunc(x)) for x in seq] if integer else seq
+            return seq
+
+    def randint(self, low, high, n=None):
+        """
+        Genera enteros uniformes en [low, high] (ambos incluidos), sin sesgo.
+
+        Usa el rechazo multiply-shift de Lemire sobre los estados enteros crudos del
+        generador, sin pasar por los Ri de 5 decimales: no hay huecos ni sesgo para
+        rangos grandes. n None -> un único int; si no, un arreglo NumPy de n enteros.
+        """
+        return self._draw(lambda seed, count: IntegerDistribution(low, high, seed, count, self.backend),
+                          "generate_integer_array", n)
 
     # ----------------------------
     # 3. Distribución normal
     # ----------------------------
-    def normal(self, mean, stddev, n=None):
+    def normal(self, mean, stddev, n=None, method="box-muller"):
         """
         Genera números bajo una distribución normal.
 
@@ -133,24 +152,125 @@ class Random:
           - mean (float): media.
           - stddev (float): desviación estándar.
           - n (int or None): cantidad de valores. None -> devuelve un único valor.
+          - method (str): "box-muller" (por defecto), "ziggurat", "polar" (Marsaglia)
+              o "inverse" (CDF inversa de Acklam, un Ri por valor y en orden).
+        Con Box-Muller un solo valor no crea objetos: cada par (u1, u2) da z0 y z1,
+        se devuelve z0 y z1 se guarda para la siguiente llamada de un solo valor.
         """
-        seed = self._get_seed()
+        if n is None and method == "box-muller":
+            z = self._normal_spare
+            if z is None:
+                u1 = max(min(self._engine.next(), 1 - 1e-10), 1e-10)
+                u2 = max(min(self._engine.next(), 1 - 1e-10), 1e-10)
+                radius = math.sqrt(-2 * math.log(u1))
+                z = radius * math.cos(2 * math.pi * u2)
+                self._normal_spare = radius * math.sin(2 * math.pi * u2)
+            else:
+                self._normal_spare = None
+            return mean + stddev * z
         if n is None:
-            normal_d = NormalDistribution(mean, stddev, seed, 1)
+            normal_d = NormalDistribution(mean, stddev, self._engine, 1, self.backend, method)
             seq = normal_d.generate_normal()
             return seq[0]
         else:
-            normal_d = NormalDistribution(mean, stddev, seed, n)
+            normal_d = NormalDistribution(mean, stddev, self._engine, n, self.backend, method)
             seq = normal_d.generate_normal()
             while not self._validate_sequence(normal_d.get_ri_sequence()):
-                seed = self._get_seed(failed_test=True)
-                normal_d = NormalDistribution(mean, stddev, seed, n)
                 seq = normal_d.generate_normal()
             return seq[0] if n == 1 else seq
 
+    def multivariate_normal(self, mean, cov, n=None, method="box-muller"):
+        """
+        Genera vectores bajo una distribución normal multivariada N(mean, cov).
+
+        Parámetros:
+          - mean (lista de d valores): vector de medias.
+          - cov (matriz d x d): covarianza simétrica definida positiva. Su factor de
+              Cholesky se guarda en caché por identidad: reutilizar el mismo objeto
+              cov evita refactorizar en cada llamada.
+          - n (int or None): cantidad de vectores. None -> un solo vector (arreglo
+              de d valores); si no, un arreglo NumPy de forma (n, d).
+          - method (str): método de NormalDistribution para las normales estándar.
+        """
+        return self._draw(lambda seed, count: MultivariateNormalDistribution(mean, cov, seed, count,
+                                                                             self.backend, method),
+                          "generate_multivariate_array", n)
+
+    # ----------------------------
+    # 4. Distribución discreta (tabla de alias)
+    # ----------------------------
+    def discrete(self, weights, n=None):
+        """
+        Genera índices en [0, k) con probabilidad proporcional a 'weights'.
+
+        Parámetros:
+          - weights (lista o AliasTable): pesos no negativos de los k resultados.
+              Para muestrear muchas veces la misma distribución conviene construir
+              una vez distributions.DiscreteDistribution.AliasTable(weights) y
+              pasarla aquí: la tabla cuesta O(k) y cada índice O(1).
+          - n (int or None): cantidad de índices. None -> un único índice (int).
+        """
+        if not isinstance(weights, AliasTable):
+            # La tabla se construye una sola vez aunque haya que regenerar
+            weights = AliasTable(weights)
+        return self._draw(lambda seed, count: DiscreteDistribution(weights, seed, count, self.backend),
+                          "generate_discrete_array", n)
+
     # ----------------------------
-    # 4. Métodos auxiliares
+    # 5. Distribuciones por rechazo (Poisson, binomial, gamma, beta)
     # ----------------------------
+    def poisson(self, lam, n=None):
+        """
+        Genera enteros bajo una distribución de Poisson de media 'lam'
+        (PTRS para lam >= 10, inversión por tabla para lam menor).
+        n None -> un único entero; si no, un arreglo NumPy de n enteros.
+        """
+        return self._draw(lambda seed, count: PoissonDistribution(lam, seed, count, self.backend),
+                          "generate_poisson_array", n)
+
+    def binomial(self, trials, p, n=None):
+        """
+        Genera enteros Binomial(trials, p) (BTPE si trials*min(p, 1-p) >= 30).
+        n None -> un único entero; si no, un arreglo NumPy de n enteros.
+        """
+        return self._draw(lambda seed, count: BinomialDistribution(trials, p, seed, count, self.backend),
+                          "generate_binomial_array", n)
+
+    def gamma(self, shape, scale=1.0, n=None):
+        """
+        Genera números Gamma(shape, scale) con el método de Marsaglia y Tsang.
+        n None -> un único valor; si no, un arreglo NumPy de n valores.
+        """
+        return self._draw(lambda seed, count: GammaDistribution(shape, scale, seed, count, self.backend),
+                          "generate_gamma_array", n)
+
+    def beta(self, a, b, n=None):
+        """
+        Genera números Beta(a, b) a partir de dos variables gamma.
+        n None -> un único valor; si no, un arreglo NumPy de n valores.
+        """
+        return self._draw(lambda seed, count: BetaDistribution(a, b, seed, count, self.backend),
+                          "generate_beta_array", n)
+
+    # ----------------------------
+    # 6. Métodos auxiliares
+    # ----------------------------
+    def _draw(self, make, method, n):
+        """
+        Crea la distribución con make(motor, cantidad) y genera con su método 'method'.
+        Igual que en los otros métodos, una secuencia (n no None) se regenera con
+        los siguientes Ri del motor hasta que pase las pruebas; un solo valor no se
+        valida, ni tampoco n = 0 (no hay Ri que probar).
+        """
+        if n is None:
+            value = getattr(make(self._engine, 1), method)()[0]
+            return value.item() if isinstance(value, np.generic) else value
+        dist = make(self._engine, n)
+        values = getattr(dist, method)()
+        while n and not self._validate_sequence(dist.get_ri_sequence()):
+            values = getattr(dist, method)()
+        return values
+
     def _validate_sequence(self, seq):
         """
         Ejecuta la lista de pruebas sobre la secuencia uniforme 'seq'.
@@ -166,20 +286,52 @@ class Random:
         return passed
 
     # ----------------------------
-    # 5. Extras
+    # 7. Extras
     # ----------------------------
 
-    def choice(self, seq):
+    def getstate(self):
+        """
+        Estado de la fachada: nivel de error, modo de semilla, semilla fija, backend,
+        estado del motor (posición en el flujo) y z1 de Box-Muller pendiente.
+        Se puede guardar en binario con utils.checkpoint.save(r, ruta).
+        """
+        return ("Random", self.error, self.deterministic, self._fixed_seed, self.backend,
+                self._engine.getstate(), self._normal_spare)
+
+    def setstate(self, state):
+        """Restaura un estado devuelto por getstate()."""
+        if state[0] != "Random":
+            raise ValueError(f"El estado es de {state[0]}, no de Random")
+        if len(state) != 7:
+            raise ValueError("El estado de Random debe incluir el estado del motor")
+        _, error, deterministic, fixed_seed, backend, engine_state, normal_spare = state
+        self.error = error
+        self.facade = RandomTestFacade(error)
+        self.deterministic = deterministic
+        self._fixed_seed = fixed_seed
+        self.backend = backend
+        self._engine = make_ri_generator(0, backend)
+        self._engine.setstate(engine_state)
+        self._normal_spare = normal_spare
+
+    def choice(self, seq, weights=None, n=None):
         """
         Elige un elemento aleatorio de la lista 'seq' si quieres usar un solo valor de un numero pseudoaleatorio pero
         que este validado puedes utilizar este metodo en conjunto con una secuencia generada con cualquiera de los metodos
         anteriores.
+        Con 'weights' (lista o AliasTable) la elección es ponderada (tabla de alias de
+        discrete()) y con 'n' se devuelve una lista de n elementos.
         """
-        # Implementación 
-        idx = int(self.uniform(0, len(seq)))
-        # Para evitar IndexError con la implementación actual
-        if idx >= len(seq):
-            idx = len(seq) - 1
-        return seq[idx]
+        if weights is None:
+            # Sin pesos basta un índice entero sin sesgo
+            indices = self.randint(0, len(seq) - 1, n)
+        else:
+            k = weights.k if isinstance(weights, AliasTable) else len(weights)
+            if k != len(seq):
+                raise ValueError("seq y weights deben tener el mismo largo")
+            indices = self.discrete(weights, n)
+        if n is None:
+            return seq[indices]
+        return [seq[i] for i in indices]
 
 
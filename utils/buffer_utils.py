@@ -0,0 +1,27 @@
+import numpy as np
+
+
+def as_writable_array(out, default_dtype=np.float64):
+    """
+    Devuelve una vista NumPy 1-D (sin copiar) sobre cualquier objeto con
+    protocolo de buffer escribible: ndarray, array.array, memoryview, mmap,
+    bytearray o shared_memory.SharedMemory.buf.
+
+    - Si el buffer tiene tipo propio (p. ej. array.array('d')), se respeta.
+    - Si es un buffer de bytes crudos, se reinterpreta con default_dtype.
+    """
+    arr = out if isinstance(out, np.ndarray) else np.asarray(memoryview(out))
+    if not arr.flags.writeable:
+        raise ValueError("El buffer de salida no es escribible")
+    raw_bytes = arr.dtype in (np.uint8, np.int8, np.dtype("S1"))
+    if raw_bytes and not isinstance(out, np.ndarray) and np.dtype(default_dtype).itemsize > 1:
+        # Buffer de bytes crudos (mmap, shared_memory, bytearray)
+        if arr.nbytes % np.dtype(default_dtype).itemsize != 0:
+            raise ValueError("El tamaño del buffer no es múltiplo del tipo de dato")
+        arr = arr.reshape(-1).view(default_dtype)
+    if arr.ndim != 1:
+        # Solo se aplana si no hace falta copiar
+        if not arr.flags.c_contiguous:
+            raise ValueError("El buffer de salida multidimensional debe ser contiguo")
+        arr = arr.reshape(-1)
+    return arr
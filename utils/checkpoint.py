@@ -0,0 +1,96 @@
+import struct
+
+# Formato binario de checkpoint:
+#   MAGIC (4 bytes) | versión (1 byte) | valor
+# donde valor es el tuple devuelto por getstate() codificado con etiquetas de 1 byte:
+#   i -> entero con signo (largo uint16 + bytes little-endian)
+#   f -> float64
+#   s -> texto utf-8 (largo uint16 + bytes)
+#   b -> booleano (1 byte)
+#   n -> None
+#   t -> tuple (cantidad uint16 + valores)
+MAGIC = b"RNGS"
+VERSION = 1
+
+
+def _encode(value, parts):
+    if isinstance(value, bool):
+        parts.append(b"b" + struct.pack("<B", value))
+    elif isinstance(value, int):
+        raw = value.to_bytes((value.bit_length() + 8) // 8, "little", signed=True)
+        parts.append(b"i" + struct.pack("<H", len(raw)) + raw)
+    elif isinstance(value, float):
+        parts.append(b"f" + struct.pack("<d", value))
+    elif isinstance(value, str):
+        raw = value.encode("utf-8")
+        parts.append(b"s" + struct.pack("<H", len(raw)) + raw)
+    elif value is None:
+        parts.append(b"n")
+    elif isinstance(value, tuple):
+        parts.append(b"t" + struct.pack("<H", len(value)))
+        for item in value:
+            _encode(item, parts)
+    else:
+        raise TypeError(f"Tipo no soportado en checkpoint: {type(value).__name__}")
+
+
+def _decode(data, pos):
+    tag = data[pos:pos + 1]
+    pos += 1
+    if tag == b"b":
+        return bool(data[pos]), pos + 1
+    if tag == b"i":
+        (size,) = struct.unpack_from("<H", data, pos)
+        pos += 2
+        return int.from_bytes(data[pos:pos + size], "little", signed=True), pos + size
+    if tag == b"f":
+        return struct.unpack_from("<d", data, pos)[0], pos + 8
+    if tag == b"s":
+        (size,) = struct.unpack_from("<H", data, pos)
+        pos += 2
+        return bytes(data[pos:pos + size]).decode("utf-8"), pos + size
+    if tag == b"n":
+        return None, pos
+    if tag == b"t":
+        (count,) = struct.unpack_from("<H", data, pos)
+        pos += 2
+        items = []
+        for _ in range(count):
+            item, pos = _decode(data, pos)
+            items.append(item)
+        return tuple(items), pos
+    raise ValueError(f"Checkpoint corrupto: etiqueta desconocida {tag!r}")
+
+
+def dumps(obj):
+    """Serializa el estado de obj (obj.getstate()) al formato binario compacto."""
+    parts = [MAGIC, struct.pack("<B", VERSION)]
+    _encode(obj.getstate(), parts)
+    return b"".join(parts)
+
+
+def loads(data, cls):
+    """
+    Reconstruye una instancia de cls a partir de un checkpoint binario, sin
+    llamar a __init__ ni regenerar el prefijo de la secuencia (O(1)).
+    """
+    if data[:4] != MAGIC:
+        raise ValueError("El archivo no es un checkpoint de generador")
+    if data[4] != VERSION:
+        raise ValueError(f"Versión de checkpoint no soportada: {data[4]}")
+    state, _ = _decode(data, 5)
+    obj = cls.__new__(cls)
+    obj.setstate(state)
+    return obj
+
+
+def save(obj, file_path):
+    """Escribe el checkpoint de obj en file_path."""
+    with open(file_path, "wb") as f:
+        f.write(dumps(obj))
+
+
+def load(file_path, cls):
+    """Lee un checkpoint de file_path y devuelve la instancia de cls restaurada."""
+    with open(file_path, "rb") as f:
+        return loads(f.read(), cls)